@@ -89,6 +89,12 @@ class PatientDataManager:
             )
             ''')
             
+            # Index sessions by patient and date for per-patient lookups
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_sessions_patient_date
+            ON treatment_sessions (patient_id, date)
+            ''')
+            
             # Create image records table
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS image_records (
@@ -468,6 +474,46 @@ class PatientDataManager:
             logger.error(f"Error retrieving sessions for patient {patient_id}: {str(e)}")
             return []
     
+    def get_latest_treatment_session(self, patient_id):
+        """
+        Retrieve the most recent treatment session for a patient.
+        
+        Args:
+            patient_id (str): Patient identifier
+            
+        Returns:
+            dict: Session information or None if the patient has no sessions
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            SELECT * FROM treatment_sessions 
+            WHERE patient_id = ? 
+            ORDER BY date DESC
+            LIMIT 1
+            ''', (patient_id,))
+            
+            row = cursor.fetchone()
+            conn.close()
+            
+            if row is None:
+                return None
+            
+            session = dict(row)
+            if session['device_settings']:
+                try:
+                    session['device_settings'] = json.loads(session['device_settings'])
+                except json.JSONDecodeError:
+                    pass  # Keep as string if not valid JSON
+            return session
+            
+        except Exception as e:
+            logger.error(f"Error retrieving latest session for patient {patient_id}: {str(e)}")
+            return None
+    
     def add_image_record(self, image_id, session_id, patient_id, image_path, 
                         image_type, notes=None):
         """
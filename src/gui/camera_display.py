@@ -9,9 +9,8 @@ import sys
 import logging
 import time
 from pathlib import Path
-import cv2
 import numpy as np
-from threading import Lock
+from collections import deque
 from datetime import datetime
 import os
 import threading
@@ -40,6 +39,10 @@ except ImportError:
         Unknown = 4
         Exclusive = 8
 
+# Rate at which the widget pulls the latest frame for display; frames arriving
+# faster than this are not rendered
+DISPLAY_FPS = 30
+
 logger = logging.getLogger(__name__)
 if os.environ.get("TOSCA_DEBUG") == "1":
     logger.setLevel(logging.DEBUG)
@@ -54,6 +57,8 @@ class CameraDisplayWidget(QWidget):
     
     # Signal emitted when a new frame is available
     frame_available = pyqtSignal(np.ndarray)
+    # Signal emitted (from an image writer thread) when a queued save finishes
+    image_saved = pyqtSignal(str, bool)
     
     def __init__(self, parent=None, vmb=None):
         """
@@ -67,13 +72,17 @@ class CameraDisplayWidget(QWidget):
         
         self.vmb = vmb
         self.camera_controller = None
-        self.current_frame = None
-        self.frame_lock = Lock()
+        # Latest displayed frame; a one-slot deque needs no lock for the
+        # single producer/consumer hand-off
+        self._frame_q = deque(maxlen=1)
         self._frame_update_lock = threading.Lock()
         
         # Current patient data
         self.current_patient = None
         
+        # Captures queued by on_capture_image whose write has not finished
+        self._pending_captures = set()
+        
         # Initialize UI
         self._init_ui()
         
@@ -82,6 +91,14 @@ class CameraDisplayWidget(QWidget):
         
         # Connect the frame_available signal to the image update slot
         self.frame_available.connect(self._on_frame_available)
+        self.image_saved.connect(self._on_image_saved)
+
+        # Pull the latest frame at the display rate instead of rendering every
+        # frame the camera delivers
+        self._displayed_seq = -1
+        self._display_timer = QTimer(self)
+        self._display_timer.setInterval(int(1000 / DISPLAY_FPS))
+        self._display_timer.timeout.connect(self._on_display_timer)
     
     def _init_ui(self):
         """Initialize the widget's UI elements."""
@@ -324,8 +341,8 @@ class CameraDisplayWidget(QWidget):
                 pixel_format=pixel_format, 
                 access_mode=access_mode
             )
-            # Set the parent_widget attribute so the controller can notify us
-            self.camera_controller.parent_widget = self
+            # Frames are pulled by _display_timer, so the controller is not
+            # given a parent_widget to push every frame to
             success = self.camera_controller.initialize()
             if not success:
                 raise Exception("Failed to initialize camera")
@@ -381,9 +398,11 @@ class CameraDisplayWidget(QWidget):
             return
         try:
             # Stop streaming if active
+            self._display_timer.stop()
             self.camera_controller.stop_stream()
             self.camera_controller.release()
             self.camera_controller = None
+            self._frame_q.clear()
             # Update UI
             self.connect_btn.setEnabled(True)
             self.disconnect_btn.setEnabled(False)
@@ -420,6 +439,8 @@ class CameraDisplayWidget(QWidget):
                 logger.error("Failed to start camera stream")
                 self.status_label.setText("Failed to start camera stream")
                 return
+            self._displayed_seq = -1
+            self._display_timer.start()
             self.start_stream_btn.setEnabled(False)
             self.stop_stream_btn.setEnabled(True)
             self.status_label.setText("Camera streaming started")
@@ -433,6 +454,8 @@ class CameraDisplayWidget(QWidget):
             return
         try:
             self.camera_controller.stop_stream()
+            self._display_timer.stop()
+            self._frame_q.clear()
             self.start_stream_btn.setEnabled(True)
             self.stop_stream_btn.setEnabled(False)
             self.status_label.setText("Camera streaming stopped")
@@ -456,11 +479,12 @@ class CameraDisplayWidget(QWidget):
         try:
             # Capture frame
             frame = None
-            # If streaming, use the current frame
-            if hasattr(self, 'current_frame') and self.current_frame is not None:
-                with self.frame_lock:
-                    if self.current_frame is not None:
-                        frame = self.current_frame.copy()
+            # If streaming, use the current frame; save_image() copies the
+            # read-only ring slot itself
+            try:
+                frame = self._frame_q[-1]
+            except IndexError:
+                pass
             # If no current frame, capture a new one
             if frame is None:
                 frame = self.camera_controller.capture_frame()
@@ -524,32 +548,44 @@ class CameraDisplayWidget(QWidget):
                 filepath = os.path.join(output_dir, filename)
                 latest_filepath = None
                 
-            # Save the image
-            success = self.camera_controller.save_image(filepath, frame)
-            
-            # Save latest image for patient if applicable
-            if success and latest_filepath:
-                self.camera_controller.save_image(latest_filepath, frame)
-                
-            if success:
-                self.status_label.setText(f"Image saved to {filepath}")
+            # Queue the image; the writer reports the outcome via image_saved
+            if self.camera_controller.save_image(filepath, frame, self.image_saved.emit):
+                self._pending_captures.add(filepath)
+                self.status_label.setText(f"Saving image to {filepath}...")
                 
-                # Ask if user wants to save this image to the current treatment session
-                if self.current_patient:
-                    reply = QMessageBox.question(
-                        self, "Add to Session",
-                        "Do you want to add this image to the current treatment session?",
-                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                        QMessageBox.StandardButton.No
-                    )
-                    if reply == QMessageBox.StandardButton.Yes:
-                        self.parent().parent().parent().on_add_image_to_session(filepath)
+                # Save latest image for patient if applicable
+                if latest_filepath:
+                    self.camera_controller.save_image(latest_filepath, frame, self.image_saved.emit)
             else:
                 self.status_label.setText("Failed to save image")
         except Exception as e:
             logger.error(f"Error capturing image: {str(e)}")
             self.status_label.setText(f"Capture error: {str(e)}")
     
+    @pyqtSlot(str, bool)
+    def _on_image_saved(self, filepath, success):
+        """Report the outcome of a save queued by on_capture_image."""
+        is_capture = filepath in self._pending_captures
+        self._pending_captures.discard(filepath)
+        if not success:
+            self.status_label.setText(f"Failed to save image to {filepath}")
+            return
+        if not is_capture:
+            return  # The patient's "latest" copy; only failures are reported
+            
+        self.status_label.setText(f"Image saved to {filepath}")
+        
+        # Ask if user wants to save this image to the current treatment session
+        if self.current_patient:
+            reply = QMessageBox.question(
+                self, "Add to Session",
+                "Do you want to add this image to the current treatment session?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.Yes:
+                self.parent().parent().parent().on_add_image_to_session(filepath)
+    
     def _update_frame(self):
         """Update the displayed frame from the camera stream."""
         # This method is now obsolete and not used. All updates are signal-based.
@@ -812,21 +848,23 @@ class CameraDisplayWidget(QWidget):
         logger.debug(f"_on_frame_available called. Frame shape: {getattr(frame, 'shape', None)}")
         if frame is None or not isinstance(frame, np.ndarray) or frame.size == 0:
             return
+        # Keep a reference (not a copy) to the displayed frame. The controller's
+        # slot stays intact for several frames; on_capture_image copies it.
+        self._frame_q.append(frame)
         height, width = frame.shape[:2]
         if frame.ndim == 2:
             qt_image = QImage(
-                frame.data, width, height, width, QImage.Format.Format_Grayscale8
+                frame.data, width, height, frame.strides[0], QImage.Format.Format_Grayscale8
             )
         elif frame.ndim == 3 and frame.shape[2] == 1:
             frame2d = np.squeeze(frame, axis=2)
             qt_image = QImage(
-                frame2d.data, width, height, width, QImage.Format.Format_Grayscale8
+                frame2d.data, width, height, frame2d.strides[0], QImage.Format.Format_Grayscale8
             )
         elif frame.ndim == 3 and frame.shape[2] == 3:
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            bytes_per_line = 3 * width
+            # Qt reads BGR directly, no per-frame BGR->RGB copy needed
             qt_image = QImage(
-                rgb_frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888
+                frame.data, width, height, frame.strides[0], QImage.Format.Format_BGR888
             )
         else:
             logger.warning("Unsupported frame format for display.")
@@ -843,7 +881,26 @@ class CameraDisplayWidget(QWidget):
         )
         self.image_label.setPixmap(scaled_pixmap)
 
+    def _on_display_timer(self):
+        """Render the controller's latest frame if it changed since the last tick."""
+        controller = self.camera_controller
+        if controller is None:
+            return
+        seq = controller.frame_sequence
+        if seq == self._displayed_seq:
+            return
+        frame = controller.peek_current_frame()
+        if frame is None:
+            return
+        self._displayed_seq = seq
+        self._on_frame_available(frame)
+
     def notify_new_frame(self, frame):
-        """Called by the camera controller when a new frame is available."""
+        """
+        Called by the camera controller when a new frame is available.
+
+        The frame is a read-only view owned by the controller (valid for
+        RING_SIZE frames); copy it before modifying or keeping it.
+        """
         # This method is thread-safe and emits the signal to the GUI thread
         self.frame_available.emit(frame)
@@ -9,6 +9,7 @@ import time
 import logging
 import serial
 import threading
+from collections import deque
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +24,13 @@ class ActuatorController:
     # Actuator movement constants
     MAX_SPEED = 100.0  # Maximum speed in percentage
     HOME_POSITION = (0, 0, 0)  # Default home position (x, y, z)
+    RX_QUEUE_SIZE = 256  # Maximum number of buffered response lines
+    # Line prefixes the actuator uses for asynchronous notifications (limit
+    # switches, faults, motion finished) rather than command responses
+    # Modify these according to your actuator's protocol
+    EVENT_PREFIXES = ("EVENT", "ALARM", "LIMIT", "!")
     
-    def __init__(self, port=None, baudrate=115200, timeout=1.0):
+    def __init__(self, port=None, baudrate=115200, timeout=1.0, event_callback=None):
         """
         Initialize the actuator controller.
         
@@ -32,16 +38,32 @@ class ActuatorController:
             port (str, optional): Serial port for actuator communication. None for auto-detect.
             baudrate (int): Baud rate for serial communication
             timeout (float): Read timeout in seconds
+            event_callback (callable, optional): Called from the reader thread with
+                each asynchronous event line (str). If None, events are queued for
+                get_events().
         """
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
         self.connection = None
         self.connected = False
+        self._connected_cached = False  # Fast-path flag checked by _send_command
         self.current_position = None
         self.is_moving = False
         self.motion_lock = threading.Lock()
         
+        # Background reader: a single producer thread pushes complete response
+        # lines into _rx_queue and _send_command (serialized by _command_lock)
+        # consumes them; event lines go to event_callback or _event_queue
+        self._rx_queue = deque(maxlen=self.RX_QUEUE_SIZE)
+        self._rx_event = threading.Event()
+        self.event_callback = event_callback
+        self._event_queue = deque(maxlen=self.RX_QUEUE_SIZE)
+        self._late_replies = 0  # Replies still owed to timed-out commands
+        self._reader_stop = threading.Event()
+        self._reader_thread = None
+        self._command_lock = threading.Lock()
+        
     def connect(self, port=None):
         """
         Connect to the actuator controller.
@@ -82,16 +104,27 @@ class ActuatorController:
                 baudrate=self.baudrate,
                 timeout=self.timeout
             )
-            
+
+            # Drain any boot-up chatter the actuator emitted before we attached
+            # so that the *IDN? reply is the first thing we read
+            time.sleep(0.05)
+            self.connection.reset_input_buffer()
+            if self.connection.in_waiting:
+                self.connection.read(self.connection.in_waiting)
+
+            self._start_reader()
+
             # Verify connection by sending a test command
             if self._verify_connection():
                 self.connected = True
+                self._connected_cached = True
                 logger.info(f"Connected to actuator on {self.port}")
                 
                 # Get the current position
                 self.current_position = self.get_position()
                 return True
             else:
+                self._stop_reader()
                 if self.connection:
                     self.connection.close()
                 self.connection = None
@@ -100,6 +133,7 @@ class ActuatorController:
                 
         except serial.SerialException as e:
             logger.error(f"Error connecting to actuator: {str(e)}")
+            self._stop_reader()
             if self.connection:
                 self.connection.close()
             self.connection = None
@@ -121,7 +155,10 @@ class ActuatorController:
                 self.stop()
                 
             # Close the connection
+            self._connected_cached = False
+            self._reader_stop.set()  # Closing the port unblocks the reader
             self.connection.close()
+            self._stop_reader()
             self.connection = None
             self.connected = False
             logger.info("Disconnected from actuator")
@@ -428,40 +465,25 @@ class ActuatorController:
         Returns:
             str or None: Response string or None if failed
         """
-        if not self.is_connected():
-            return None
+        # Trust the cached flag in the hot path (e.g. IS_BUSY? polling) and only
+        # fall back to the full is_connected() check when it is not set
+        if not self._connected_cached:
+            if not self.is_connected():
+                return None
+            self._connected_cached = True
             
         try:
-            # Set custom timeout if specified
-            original_timeout = None
-            if timeout is not None and self.connection:
-                original_timeout = self.connection.timeout
-                self.connection.timeout = timeout
-                
             # Add command termination if needed
             if not command.endswith('\r\n'):
                 command += '\r\n'
                 
-            # Send the command
-            self.connection.write(command.encode('utf-8'))
-            logger.debug(f"Sent command to actuator: {command.strip()}")
-            
-            # Read the response
-            response = ""
-            start_time = time.time()
-            max_time = start_time + (timeout if timeout is not None else self.timeout)
-            
-            while time.time() < max_time:
-                if self.connection.in_waiting > 0:
-                    chunk = self.connection.readline().decode('utf-8', errors='replace')
-                    response += chunk
-                    if chunk.endswith('\n'):  # End of response
-                        break
-                time.sleep(0.01)
+            with self._command_lock:
+                # Send the command
+                self.connection.write(command.encode('utf-8'))
+                logger.debug(f"Sent command to actuator: {command.strip()}")
                 
-            # Restore original timeout
-            if original_timeout is not None:
-                self.connection.timeout = original_timeout
+                # Wait for the reader thread to deliver the response line
+                response = self._wait_for_line(timeout if timeout is not None else self.timeout)
                 
             if response:
                 logger.debug(f"Received response from actuator: {response.strip()}")
@@ -471,9 +493,139 @@ class ActuatorController:
                 return None
                 
         except Exception as e:
+            self._connected_cached = False
             logger.error(f"Error sending command to actuator: {str(e)}")
             return None
     
+    def get_events(self):
+        """
+        Take the asynchronous event lines received since the last call.
+        
+        Only used when no event_callback is set.
+        
+        Returns:
+            list: Event lines (str), oldest first
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._event_queue.popleft())
+            except IndexError:
+                return events
+    
+    def _is_event_line(self, line):
+        """
+        Classify a line from the actuator.
+        
+        Args:
+            line (str): Decoded, stripped line
+            
+        Returns:
+            bool: True for an asynchronous event, False for a command response
+        """
+        return line.startswith(self.EVENT_PREFIXES)
+    
+    def _dispatch_event(self, line):
+        """Hand an event line to event_callback, or queue it for get_events()."""
+        callback = self.event_callback
+        if callback is None:
+            self._event_queue.append(line)
+            return
+        try:
+            callback(line)
+        except Exception as e:
+            logger.error(f"Error in actuator event callback: {str(e)}")
+    
+    def _wait_for_line(self, timeout):
+        """
+        Pop the response line for the command just sent.
+        
+        The reader thread only queues response lines. Replies that arrive late
+        for earlier, timed-out commands come first on the wire and are skipped.
+        
+        Args:
+            timeout (float): Maximum time to wait in seconds
+            
+        Returns:
+            str: Decoded response line, or an empty string on timeout
+        """
+        deadline = time.monotonic() + timeout
+        skipped = False
+        while True:
+            try:
+                line = self._rx_queue.popleft().decode('utf-8', errors='replace')
+            except IndexError:
+                pass
+            else:
+                if self._late_replies:
+                    self._late_replies -= 1
+                    skipped = True
+                    logger.debug(f"Skipping late actuator reply: {line.strip()}")
+                    continue
+                return line
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # This command may still answer. If the line we skipped was in
+                # fact its reply, nothing is owed; older missing replies are
+                # assumed lost so a silent actuator cannot eat later responses
+                self._late_replies = 0 if skipped else 1
+                return ""
+            self._rx_event.wait(remaining)
+            self._rx_event.clear()
+    
+    def _start_reader(self):
+        """Start the background thread that reads response lines from the port."""
+        self._rx_queue.clear()
+        self._rx_event.clear()
+        self._late_replies = 0
+        self._reader_stop.clear()
+        self._reader_thread = threading.Thread(
+            target=self._reader_loop,
+            name="ActuatorReader",
+            daemon=True
+        )
+        self._reader_thread.start()
+    
+    def _stop_reader(self):
+        """Signal the reader thread to exit and wait for it to finish."""
+        self._reader_stop.set()
+        if self._reader_thread is not None and self._reader_thread is not threading.current_thread():
+            self._reader_thread.join(timeout=self.timeout + 0.5)
+        self._reader_thread = None
+    
+    def _reader_loop(self):
+        """
+        Reader thread body.
+        
+        Blocks in read_until() on the serial port and classifies every complete
+        line: responses go into the RX queue, waking any command waiting for
+        one, and events go to _dispatch_event().
+        """
+        connection = self.connection
+        pending = bytearray()
+        while not self._reader_stop.is_set():
+            try:
+                chunk = connection.read_until(b'\n')
+            except (serial.SerialException, TypeError, AttributeError) as e:
+                # The port was closed underneath us (disconnect) or failed
+                if not self._reader_stop.is_set():
+                    logger.error(f"Actuator reader stopped: {str(e)}")
+                    self._connected_cached = False
+                break
+            if not chunk:
+                continue  # Read timeout, check the stop flag again
+            pending.extend(chunk)
+            if pending.endswith(b'\n'):
+                line = bytes(pending)
+                pending.clear()
+                text = line.decode('utf-8', errors='replace').strip()
+                if self._is_event_line(text):
+                    logger.debug(f"Actuator event: {text}")
+                    self._dispatch_event(text)
+                    continue
+                self._rx_queue.append(line)
+                self._rx_event.set()
+    
     def _verify_connection(self):
         """
         Verify that we're connected to the actuator.
@@ -5,13 +5,70 @@ This module provides an interface for communicating with and controlling
 a laser device via serial communication.
 """
 
+import re
+import sys
 import time
+import struct
+import asyncio
 import logging
+import threading
 import serial
 from serial.tools import list_ports
 
 logger = logging.getLogger(__name__)
 
+# Matches "key: value" lines of a raw STATUS response in a single pass
+_STATUS_RE = re.compile(
+    rb'^\s*(power|enabled|temp|error)\s*:\s*(.+?)\s*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Encoded, terminated bytes of the fixed commands; commands with parameters
+# (e.g. POWER) are encoded when sent
+_CMD_CACHE: dict[str, bytes] = {
+    command: f"{command}\r\n".encode('utf-8')
+    for command in ("*IDN?", "STATUS", "ENABLE", "DISABLE")
+}
+
+# Formatter for the power command (without line terminator, so it can be
+# combined with other commands)
+_POWER_FMT = "POWER {:.1f}".format
+
+# (timestamp, port info list) from the last serial port scan, reused for _PORTS_CACHE_TTL seconds
+_ports_cache = None
+_PORTS_CACHE_TTL = 0.5
+
+# Binary protocol: opcode/sub-command for setting power, and the ACK byte the device replies with
+_BIN_SET_POWER = (0x50, 0x01)
+_BIN_ACK = b'\x06'
+
+def _build_crc8_table(poly=0x07):
+    """Build the lookup table for CRC-8 with the given polynomial."""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return bytes(table)
+
+_CRC8_TABLE = _build_crc8_table()
+
+def _crc8(data):
+    """Compute the CRC-8 (polynomial 0x07) checksum of data."""
+    crc = 0
+    for byte in data:
+        crc = _CRC8_TABLE[crc ^ byte]
+    return crc
+
+# Status response key -> (status dict key, value converter)
+_STATUS_FIELDS = {
+    b'power': ('power', float),
+    b'enabled': ('enabled', lambda value: value.lower() == b'true'),
+    b'temp': ('temperature', float),
+    b'error': ('error', lambda value: value.decode('utf-8', errors='replace') if value != b'none' else None),
+}
+
 class LaserController:
     """
     Controller class for interfacing with a laser device over serial connection.
@@ -20,6 +77,18 @@ class LaserController:
     It handles the communication protocol, command formatting, and response parsing.
     """
     
+    # USB (VID, PID) pairs of known laser interfaces. Ports matching one of these
+    # are probed first during auto-detection.
+    # Modify this set according to your laser device's USB interface
+    KNOWN_USB_IDS = frozenset({
+        (0x0403, 0x6001),  # FTDI FT232R
+        (0x0403, 0x6015),  # FTDI FT231X
+    })
+    
+    # Models (as reported by *IDN?) that accept the compact binary protocol.
+    # Modify this set according to your laser device's firmware
+    BINARY_PROTOCOL_MODELS = frozenset()
+    
     def __init__(self, port=None, baudrate=9600, timeout=1):
         """
         Initialize the laser controller.
@@ -34,17 +103,60 @@ class LaserController:
         self.timeout = timeout
         self.connection = None
         self.connected = False
+        self._is_open = False  # Cached connection state, see is_connected()
         self.device_info = {}
+        self._idn_response = None  # *IDN? reply captured during verification
+        self._binary_protocol = False  # Set by _get_device_info for supported models
+        self._io_lock = threading.Lock()  # Serializes command/response exchanges
         
     def list_available_ports(self):
         """
         List all available serial ports on the system.
         
+        Enumerating ports walks the OS device tree, so the result is reused for
+        a short time to keep repeated calls (auto-detection, UI refreshes) cheap.
+        
         Returns:
             list: List of available serial port names.
         """
-        available_ports = list_ports.comports()
-        return [port.device for port in available_ports]
+        return [port_info.device for port_info in self._scan_ports()]
+    
+    def _scan_ports(self):
+        """
+        Return the port info entries from list_ports.comports(), cached briefly.
+        
+        Returns:
+            list: ListPortInfo entries for all serial ports on the system.
+        """
+        global _ports_cache
+        now = time.monotonic()
+        if _ports_cache is None or now - _ports_cache[0] >= _PORTS_CACHE_TTL:
+            _ports_cache = (now, list(list_ports.comports()))
+        return _ports_cache[1]
+    
+    def _candidate_ports(self):
+        """
+        Order the available ports for auto-detection.
+        
+        Ports whose USB VID/PID is in KNOWN_USB_IDS come first so the laser is
+        normally found on the first probe; all other ports are tried afterwards.
+        
+        Returns:
+            list: Serial port names in probing order.
+        """
+        known, unknown = [], []
+        for port_info in self._scan_ports():
+            if (port_info.vid, port_info.pid) in self.KNOWN_USB_IDS:
+                known.append(port_info.device)
+            else:
+                unknown.append(port_info.device)
+        return known + unknown
+    
+    @staticmethod
+    def _invalidate_ports_cache():
+        """Force the next list_available_ports() call to rescan the system."""
+        global _ports_cache
+        _ports_cache = None
     
     def connect(self, port=None):
         """
@@ -62,7 +174,7 @@ class LaserController:
             
         # Auto-detect port if not specified
         if self.port is None:
-            available_ports = self.list_available_ports()
+            available_ports = self._candidate_ports()
             if not available_ports:
                 logger.error("No serial ports found")
                 return False
@@ -74,14 +186,17 @@ class LaserController:
                     temp_connection = serial.Serial(
                         port=port_to_try,
                         baudrate=self.baudrate,
-                        timeout=self.timeout
+                        timeout=self.timeout,
+                        write_timeout=self.timeout
                     )
                     # Temporarily assign for _verify_connection to use
                     self.connection = temp_connection 
+                    self._configure_port()
                     if self._verify_connection():
                         self.port = port_to_try
                         # self.connection is already set to temp_connection
                         self.connected = True
+                        self._is_open = True
                         logger.info(f"Successfully connected to and verified laser on {self.port}")
                         self._get_device_info()
                         return True
@@ -91,6 +206,7 @@ class LaserController:
                         logger.info(f"Verification failed on port {port_to_try}")
                 except serial.SerialException as e:
                     logger.warning(f"Could not open or test port {port_to_try}: {e}")
+                    self._invalidate_ports_cache()
                     if self.connection: # Ensure it's closed if partially opened
                         self.connection.close()
                     self.connection = None
@@ -107,12 +223,15 @@ class LaserController:
                 self.connection = serial.Serial(
                     port=self.port,
                     baudrate=self.baudrate,
-                    timeout=self.timeout
+                    timeout=self.timeout,
+                    write_timeout=self.timeout
                 )
+                self._configure_port()
             
             # Verify connection (again if port was specified, or as final check)
             if self._verify_connection():
                 self.connected = True
+                self._is_open = True
                 logger.info(f"Connected to laser device on {self.port}")
                 self._get_device_info()
                 return True
@@ -124,6 +243,7 @@ class LaserController:
                 
         except serial.SerialException as e:
             logger.error(f"Failed to connect to port {self.port}: {str(e)}")
+            self._invalidate_ports_cache()
             self.connection = None
             return False
     
@@ -139,6 +259,7 @@ class LaserController:
                 self.connection.close()
                 self.connection = None
                 self.connected = False
+                self._is_open = False
                 logger.info("Disconnected from laser device")
                 return True
             except serial.SerialException as e:
@@ -153,7 +274,13 @@ class LaserController:
         Returns:
             bool: True if connected, False otherwise.
         """
-        return self.connected and self.connection is not None and self.connection.is_open
+        # _is_open is set on connect and cleared on disconnect and on every
+        # serial error path, so the driver's is_open property is only
+        # consulted as a consistency check when debugging
+        if self._is_open and logger.isEnabledFor(logging.DEBUG):
+            if self.connection is None or not self.connection.is_open:
+                logger.debug("Cached connection state is stale: port is closed")
+        return self._is_open
     
     def send_command(self, command, wait_for_response=True, timeout=1.0):
         """
@@ -167,29 +294,89 @@ class LaserController:
         Returns:
             str or None: Response from the device, or None if no response or error.
         """
+        response = self._send_command_raw(command, wait_for_response, timeout)
+        if response:
+            return response.decode('utf-8', errors='replace')
+        return None
+    
+    def _send_command_raw(self, command, wait_for_response=True, timeout=1.0, expect_ok=0):
+        """
+        Send a command to the laser device and return the undecoded response.
+        
+        Args:
+            command (str): Command to send.
+            wait_for_response (bool, optional): Whether to wait for a response. Defaults to True.
+            timeout (float, optional): Response timeout in seconds. Defaults to 1.0.
+            expect_ok (int, optional): Keep reading lines until this many "OK"
+                replies arrived or the timeout expires. Defaults to 0 (one read).
+            
+        Returns:
+            bytes or None: Raw response from the device, or None if no response or error.
+        """
         if not self.is_connected():
             logger.error("Cannot send command: Not connected to device")
             return None
             
         try:
-            # Convert command to bytes and add termination if needed
-            if not command.endswith('\r\n'):
-                command += '\r\n'
+            # Convert command to bytes and add termination if needed,
+            # reusing the pre-encoded form of fixed commands
+            data = _CMD_CACHE.get(command)
+            if data is None:
+                terminated = command if command.endswith('\r\n') else command + '\r\n'
+                data = terminated.encode('utf-8')
             
-            # Send the command
-            self.connection.write(command.encode('utf-8'))
-            logger.debug(f"Sent command: {command.strip()}")
+            with self._io_lock:
+                # Send the command
+                self.connection.write(data)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Sent command: %s", command.rstrip())
+                
+                # Wait for and return the response if requested
+                if wait_for_response:
+                    return self._read_response(timeout, expect_ok)
+                return None
             
-            # Wait for and return the response if requested
-            if wait_for_response:
-                return self._read_response(timeout)
+        except serial.SerialTimeoutException as e:
+            # A stalled TX (flow control, unplugged cable) must not block forever
+            logger.error(f"Timed out writing command: {str(e)}")
+            self.connected = False
+            self._is_open = False
             return None
-            
         except serial.SerialException as e:
             logger.error(f"Error sending command: {str(e)}")
             self.connected = False
+            self._is_open = False
             return None
     
+    async def send_command_async(self, command, wait_for_response=True, timeout=1.0):
+        """
+        Send a command to the laser device without blocking the event loop.
+        
+        The blocking serial exchange runs in a worker thread, so asyncio callers
+        can service other hardware while a laser command is outstanding.
+        
+        Args:
+            command (str): Command to send.
+            wait_for_response (bool, optional): Whether to wait for a response. Defaults to True.
+            timeout (float, optional): Response timeout in seconds. Defaults to 1.0.
+            
+        Returns:
+            str or None: Response from the device, or None if no response or error.
+        """
+        return await asyncio.to_thread(self.send_command, command, wait_for_response, timeout)
+    
+    async def connect_async(self, port=None):
+        """
+        Connect to the laser device without blocking the event loop.
+        
+        Args:
+            port (str, optional): Serial port to use. See connect().
+                
+        Returns:
+            bool: True if connection was successful, False otherwise.
+        """
+        return await asyncio.to_thread(self.connect, port)
+    
     def set_power(self, power_level):
         """
         Set the laser power level.
@@ -200,21 +387,36 @@ class LaserController:
         Returns:
             bool: True if successful, False otherwise.
         """
-        # Ensure power_level is within valid range
-        power_level = max(0.0, min(100.0, power_level))
-        
-        # Format depends on the specific laser protocol
-        # Modify this command according to your laser device's protocol
-        command = f"POWER {power_level:.1f}"
+        power_level = self._clamp_power(power_level)
         
-        response = self.send_command(command)
-        if response and "OK" in response:
-            logger.info(f"Set laser power to {power_level}%")
+        if self._send_power(power_level):
+            logger.info("Set laser power to %s%%", power_level)
             return True
         else:
-            logger.error(f"Failed to set laser power to {power_level}%")
+            logger.error("Failed to set laser power to %s%%", power_level)
             return False
     
+    @staticmethod
+    def _clamp_power(power_level):
+        """Limit a power level to the valid range of 0.0 to 100.0."""
+        if not 0.0 <= power_level <= 100.0:
+            power_level = 0.0 if power_level < 0.0 else 100.0
+        return power_level
+    
+    def _send_power(self, power_level):
+        """
+        Send an already clamped power level using the device's protocol.
+        
+        Returns:
+            bool: True if the device acknowledged the command, False otherwise.
+        """
+        # Format depends on the specific laser protocol
+        # Modify this command according to your laser device's protocol
+        if self._binary_protocol:
+            return self._send_frame(struct.pack('>BBf', *_BIN_SET_POWER, power_level))
+        response = self._send_command_raw(_POWER_FMT(power_level))
+        return bool(response) and b"OK" in response
+    
     def enable_laser(self, enable=True):
         """
         Enable or disable the laser output.
@@ -227,8 +429,8 @@ class LaserController:
         """
         command = "ENABLE" if enable else "DISABLE"
         
-        response = self.send_command(command)
-        if response and "OK" in response:
+        response = self._send_command_raw(command)
+        if response and b"OK" in response:
             status = "enabled" if enable else "disabled"
             logger.info(f"Laser {status}")
             return True
@@ -237,6 +439,50 @@ class LaserController:
             logger.error(f"Failed to {action} laser")
             return False
     
+    def set_power_and_enable(self, power_level, enable=True):
+        """
+        Set the laser power level and enable or disable output in one exchange.
+        
+        Both commands are sent as a single ';'-separated compound command, which
+        saves a full round trip compared to calling set_power() and then
+        enable_laser(). The device must accept compound commands. Devices using
+        the binary protocol get the power frame followed by the enable command;
+        output is not enabled if setting the power failed.
+        
+        Args:
+            power_level (float): Power level to set (0.0 to 100.0).
+            enable (bool, optional): True to enable, False to disable. Defaults to True.
+            
+        Returns:
+            bool: True if the device acknowledged both commands, False otherwise.
+        """
+        power_level = self._clamp_power(power_level)
+        
+        if self._binary_protocol:
+            # The binary protocol has no compound form; never enable at an unknown power
+            power_ok = self._send_power(power_level)
+            if enable and not power_ok:
+                success = False
+            else:
+                success = self.enable_laser(enable) and power_ok
+        else:
+            # Format depends on the specific laser protocol
+            # Modify this command according to your laser device's protocol
+            command = f"{_POWER_FMT(power_level)};{'ENABLE' if enable else 'DISABLE'}"
+            
+            # Expect one OK per sub-command, possibly on separate lines
+            response = self._send_command_raw(command, expect_ok=2)
+            success = bool(response) and response.count(b"OK") >= 2
+        
+        if success:
+            logger.info("Set laser power to %s%% and %s laser", power_level,
+                        "enabled" if enable else "disabled")
+            return True
+        else:
+            logger.error("Failed to set laser power to %s%% and %s laser", power_level,
+                         "enable" if enable else "disable")
+            return False
+    
     def get_status(self):
         """
         Get the current status of the laser device.
@@ -244,7 +490,7 @@ class LaserController:
         Returns:
             dict: Dictionary containing status information, or None if failed.
         """
-        response = self.send_command("STATUS")
+        response = self._send_command_raw("STATUS")
         if not response:
             logger.error("Failed to get laser status")
             return None
@@ -261,41 +507,67 @@ class LaserController:
         
         # Example parsing - modify according to your device's response format
         try:
-            for line in response.strip().split('\n'):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    key = key.strip().lower()
-                    value = value.strip()
-                    
-                    if key == 'power':
-                        status['power'] = float(value)
-                    elif key == 'enabled':
-                        status['enabled'] = value.lower() == 'true'
-                    elif key == 'temp':
-                        status['temperature'] = float(value)
-                    elif key == 'error':
-                        status['error'] = value if value != 'none' else None
+            for match in _STATUS_RE.finditer(response):
+                field, convert = _STATUS_FIELDS[match.group(1).lower()]
+                status[field] = convert(match.group(2))
         except Exception as e:
             logger.error(f"Error parsing status response: {str(e)}")
             return None
             
         return status
     
+    def _configure_port(self):
+        """Apply platform-specific tuning to a freshly opened port."""
+        self._set_low_latency()
+        # Windows only: enlarge the driver buffers so bursty replies are not dropped
+        if hasattr(self.connection, 'set_buffer_size'):
+            try:
+                self.connection.set_buffer_size(rx_size=65536, tx_size=4096)
+            except serial.SerialException as e:
+                logger.debug(f"Could not set buffer size on {self.connection.port}: {e}")
+    
+    def _set_low_latency(self):
+        """
+        Enable ASYNC_LOW_LATENCY on the open port (Linux only).
+        
+        FTDI and CDC-ACM drivers otherwise hold small replies for up to 16 ms
+        before handing them to userspace. Ports that do not support the flag
+        keep their default settings.
+        """
+        if not sys.platform.startswith('linux'):
+            return
+        # pyserial issues the TIOCGSERIAL/TIOCSSERIAL ioctl pair for us
+        set_low_latency_mode = getattr(self.connection, 'set_low_latency_mode', None)
+        if set_low_latency_mode is None:
+            return
+        try:
+            set_low_latency_mode(True)
+            logger.debug(f"Enabled low-latency mode on {self.connection.port}")
+        except (OSError, ValueError) as e:
+            logger.debug(f"Low-latency mode not supported on {self.connection.port}: {e}")
+    
     def _verify_connection(self):
         """
         Verify that we are connected to a valid laser device.
         
+        The identification reply is also stored in self._idn_response so that
+        _get_device_info can reuse it instead of querying the device again.
+        
         Returns:
-            bool: True if verification succeeded, False otherwise.
+            bytes or None: The raw *IDN? response if verification succeeded, None otherwise.
         """
         # Send a simple command that any compliant laser device should respond to
         # Modify this according to your laser device's protocol
-        response = self._read_response(timeout=0.5)  # Clear any pending data first
+        self.connection.reset_input_buffer()  # Clear any pending data first
         
-        response = self.send_command("*IDN?")
+        response = self._send_command_raw("*IDN?")
         # Verify the response contains expected identification info
         # This validation depends on your specific laser device
-        return response is not None and len(response) > 0
+        if not response:
+            self._idn_response = None
+            return None
+        self._idn_response = response
+        return response
     
     def _get_device_info(self):
         """
@@ -306,60 +578,126 @@ class LaserController:
         """
         # Retrieve basic device information using appropriate commands
         # This depends on your specific laser device's protocol
-        response = self.send_command("*IDN?")
+        # Reuse the reply from _verify_connection when available
+        response = self._idn_response
+        self._idn_response = None
+        if not response:
+            response = self._send_command_raw("*IDN?")
         
         if response:
-            # Parse the identification string
-            # Format depends on your device - modify accordingly
-            parts = response.strip().split(',')
-            if len(parts) >= 3:
-                self.device_info = {
-                    'manufacturer': parts[0].strip(),
-                    'model': parts[1].strip(),
-                    'serial': parts[2].strip(),
-                    'firmware': parts[3].strip() if len(parts) > 3 else None
-                }
-            else:
-                self.device_info = {'raw_response': response.strip()}
+            self.device_info = self._parse_idn(response.decode('ascii', errors='replace'))
+            self._binary_protocol = self.device_info.get('model') in self.BINARY_PROTOCOL_MODELS
+            if self._binary_protocol:
+                logger.info("Laser supports the binary protocol, using it for power commands")
                 
         return self.device_info
     
-    def _read_response(self, timeout=1.0):
+    @staticmethod
+    def _parse_idn(response):
+        """
+        Parse an *IDN? identification string.
+        
+        Args:
+            response (str): Raw identification response from the device.
+            
+        Returns:
+            dict: Manufacturer, model, serial and firmware fields, or the raw
+                response if it does not have the expected layout.
+        """
+        # Format depends on your device - modify accordingly
+        parts = response.strip().split(',')
+        if len(parts) >= 3:
+            return {
+                'manufacturer': parts[0].strip(),
+                'model': parts[1].strip(),
+                'serial': parts[2].strip(),
+                'firmware': parts[3].strip() if len(parts) > 3 else None
+            }
+        return {'raw_response': response.strip()}
+    
+    def _send_frame(self, body, timeout=1.0):
+        """
+        Send a binary protocol frame and wait for the device's acknowledgement.
+        
+        The frame is laid out as a length byte, the body, and a CRC-8 trailer
+        computed over the length and body.
+        
+        Args:
+            body (bytes): Frame body (opcode, sub-command and payload).
+            timeout (float, optional): Acknowledgement timeout in seconds. Defaults to 1.0.
+            
+        Returns:
+            bool: True if the device acknowledged the frame, False otherwise.
+        """
+        if not self.is_connected():
+            logger.error("Cannot send frame: Not connected to device")
+            return False
+        
+        frame = bytearray((len(body),))
+        frame += body
+        frame.append(_crc8(frame))
+        
+        try:
+            with self._io_lock:
+                self.connection.write(frame)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Sent frame: %s", frame.hex())
+                
+                if self.connection.timeout != timeout:
+                    self.connection.timeout = timeout
+                return self.connection.read(1) == _BIN_ACK
+                
+        except serial.SerialException as e:
+            logger.error(f"Error sending frame: {str(e)}")
+            self.connected = False
+            self._is_open = False
+            return False
+    
+    def _read_response(self, timeout=1.0, expect_ok=0):
         """
         Read a response from the device.
         
         Args:
             timeout (float, optional): Response timeout in seconds. Defaults to 1.0.
+            expect_ok (int, optional): Keep reading lines until this many "OK"
+                replies arrived or the timeout expires. Defaults to 0 (one read).
             
         Returns:
-            str or None: Response string, or None if timeout or error.
+            bytes or None: Raw response, or None if timeout or error.
         """
         if not self.is_connected():
             return None
             
         try:
-            # Set the timeout for this read operation
-            original_timeout = self.connection.timeout
-            self.connection.timeout = timeout
+            deadline = time.monotonic() + timeout
             
-            # Read until we get a complete response
-            response = ""
-            start_time = time.time()
+            # Only touch the driver timeout when it actually changes
+            if self.connection.timeout != timeout:
+                self.connection.timeout = timeout
             
-            while time.time() - start_time < timeout:
-                if self.connection.in_waiting > 0:
-                    chunk = self.connection.readline().decode('utf-8', errors='replace')
-                    response += chunk
-                    if chunk.endswith('\n'):  # Got a complete line
-                        break
-                time.sleep(0.01)  # Short sleep to prevent CPU hogging
-                
-            # Restore original timeout
-            self.connection.timeout = original_timeout
+            # Block in the driver until a full line arrives or the timeout expires
+            data = self.connection.read_until(b'\n', size=4096)
+            
+            # Multi-line replies (e.g. STATUS) are usually already buffered by
+            # the OS by now, so pick up the rest with a single read
+            if data and self.connection.in_waiting:
+                data += self.connection.read(self.connection.in_waiting)
+            
+            # Replies to compound commands may arrive as separate, delayed lines
+            while data.count(b"OK") < expect_ok:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.connection.timeout = remaining
+                line = self.connection.read_until(b'\n', size=4096)
+                if not line:
+                    break
+                data += line
             
-            if response:
-                logger.debug(f"Received response: {response.strip()}")
-                return response
+            if data:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Received response: %r", data.strip())
+                return data
             else:
                 logger.debug("No response received (timeout)")
                 return None
@@ -367,4 +705,5 @@ class LaserController:
         except serial.SerialException as e:
             logger.error(f"Error reading response: {str(e)}")
             self.connected = False
+            self._is_open = False
             return None 
\ No newline at end of file
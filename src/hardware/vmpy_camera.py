@@ -7,12 +7,22 @@ This module provides functionality to interface with AVT cameras using VmbPy SDK
 
 import cv2
 import numpy as np
+import asyncio
+import copy
+import json
 import logging
+import multiprocessing
+import os
+import queue
+import sys
 import time
-from threading import Thread, Lock
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Callable
+from threading import Thread, Lock, RLock, Event, Condition, current_thread, get_native_id
 try:
     import vmbpy
-    from vmbpy import VmbSystem, VmbCameraError, Camera, Frame, FrameStatus, PixelFormat, AccessMode
+    from vmbpy import VmbSystem, VmbCameraError, Camera, Frame, FrameStatus, PixelFormat, AccessMode, AllocationMode
 except ImportError:
     logging.error("VmbPy module not found. Please install the VmbPy package.")
     # Define dummy classes if VmbPy is not available to avoid runtime errors on import
@@ -30,47 +40,163 @@ except ImportError:
         Read = 2
         Unknown = 4
         Exclusive = 8
+    class AllocationMode:
+        AnnounceFrame = 0
+        AllocAndAnnounceFrame = 1
+
+# Optional SIMD-accelerated JPEG encoder; falls back to OpenCV when missing
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJPF_GRAY, TJSAMP_420, TJSAMP_GRAY
+except ImportError:
+    TurboJPEG = None
 
 logger = logging.getLogger(__name__)
 
 # Define a default buffer count for streaming
 DEFAULT_BUFFER_COUNT = 10
 
+# Number of published frames kept in the ring (about 2x the expected burst)
+RING_SIZE = 8
+
+# Maximum number of images waiting to be written by the background writer;
+# enough for a burst of captures. When full, the oldest pending image is dropped
+WRITER_QUEUE_SIZE = 64
+# Writer threads; OpenCV releases the GIL while encoding, so bursts encode in parallel
+WRITER_THREADS = 2
+# Fast encoder settings: PNG level 1 is several times faster than the default 3
+PNG_COMPRESSION = 1
+JPEG_QUALITY = 90
+
+# Bytes reserved at the start of the shared-memory ring for the per-slot
+# sequence numbers (int64 each), rounded up to a cache line
+SHARED_HEADER_BYTES = -(-RING_SIZE * 8 // 64) * 64
+# Bound of frame_index_queue: the consumer reuses a slot RING_SIZE frames
+# later, so queued indices must stay well short of that
+SHARED_INDEX_QUEUE_SIZE = RING_SIZE - 2
+
+# Frames that may wait for the consumer while recording, when every frame is
+# kept instead of only the newest one; frames beyond this are counted as skipped
+RECORD_BACKLOG = 64
+
+# Seconds between frame statistics summaries logged by the consumer thread
+STATS_INTERVAL = 1.0
+
+# SCHED_FIFO priorities used when real-time scheduling is enabled (Linux only)
+ACQUISITION_RT_PRIORITY = 10
+CONSUMER_RT_PRIORITY = 5
+
 class VMPyCameraController:
     """
     Controller class for interfacing with AVT cameras using VmbPy SDK.
 
     Uses VmbPy's asynchronous streaming API with a callback.
+
+    Frame ownership: streamed frames are published into a ring of RING_SIZE
+    slots that are read-only outside the consumer thread. current_frame,
+    peek_current_frame(), get_last_n(), wait_for_frame(), notify_new_frame()
+    and frame_queue all hand out these read-only frames without copying; a
+    frame stays intact for RING_SIZE frames. Callers that modify a frame or
+    keep it longer copy it themselves (get_current_frame() and capture_frame()
+    return such copies).
     """
 
     # Signal to be potentially connected by the GUI widget to receive frames
     # Note: This requires making this class a QObject if used directly with Qt signals.
-    # For simplicity, we'll stick to the get_current_frame() pull method for now.
+    # For simplicity, we'll stick to the get_current_frame()/peek_current_frame() pull methods for now.
     # frame_ready = pyqtSignal(np.ndarray)
 
-    def __init__(self, vmb, camera_id=None, resolution=None, pixel_format=PixelFormat.Mono8, access_mode=AccessMode.Full):
+    def __init__(self, vmb=None, camera_id=None, resolution=None, pixel_format=PixelFormat.Mono8, access_mode=AccessMode.Full,
+                 realtime_cpus=None, share_frames=False):
         """
         Initialize the camera controller.
 
         Args:
-            vmb (VmbSystem): An active VmbSystem instance (from a context manager)
+            vmb (VmbSystem): An active VmbSystem instance (from a context manager).
+                The caller owns its lifetime and the controller never re-enters it,
+                as src/main.py does for the whole application. If None, initialize()
+                enters a VmbSystem itself and release() exits it (standalone use).
             camera_id (str): Camera ID or index. If None, first available camera will be used.
             resolution (tuple): Desired resolution (width, height). Applied if possible.
             pixel_format (vmbpy.PixelFormat): Desired pixel format. Defaults to Mono8.
             access_mode (vmbpy.AccessMode): Desired access mode. Defaults to Full.
+            realtime_cpus (tuple): Optional (acquisition_cpu, consumer_cpu). When given,
+                the VmbPy callback thread and the consumer thread are pinned to these
+                CPUs and run with SCHED_FIFO priority (Linux; needs CAP_SYS_NICE).
+            share_frames (bool): Back the frame ring with shared memory and post the
+                index and sequence number of each published slot to
+                frame_index_queue, so a viewer in another process can read frames
+                without pickling them (see attach_shared_ring/read_shared_frame).
         """
         if PixelFormat.Mono8 is None and vmb is not None: # Check if VmbPy loaded correctly
             raise ImportError("VmbPy types (PixelFormat) not available.")
 
         self.vmb = vmb
+        self._owns_vmb: bool = False  # True if initialize() entered the VmbSystem itself
         self.camera_id = camera_id
         self.resolution = resolution
         self.pixel_format = pixel_format
         self.access_mode = access_mode
         self.camera: Camera | None = None
+        # The camera context is entered once in initialize() and held until
+        # release(), so feature access does not reopen the device every call
+        self._cam: Camera | None = None
+        self._cam_lock: RLock = RLock()
+        # Feature objects by name; valid while the camera stays open
+        self._feature_cache: dict = {}
         self.is_running: bool = False
-        self.current_frame: np.ndarray | None = None
-        self.frame_lock: Lock = Lock()
+        self.current_frame: np.ndarray | None = None  # Most recently published slot
+        # Optional asyncio hand-off (see attach_event_loop); holds only the newest frame
+        self.frame_queue: asyncio.Queue | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Ring of pre-allocated frame slots: each frame is copied into the next
+        # slot and published, so the last RING_SIZE frames stay available
+        self._ring: list[np.ndarray] | None = None
+        self._write_idx: int = 0  # Total frames published; next slot is _write_idx % RING_SIZE
+        # Lets callers block until the next frame is published (wait_for_frame)
+        self._frame_cond: Condition = Condition()
+        self._frame_seq: int = 0  # Never reset, unlike _write_idx
+        # Let the transport layer allocate (and keep) the stream buffers; falls
+        # back to VmbPy-allocated buffers if the TL does not support it
+        self._allocation_mode = AllocationMode.AllocAndAnnounceFrame
+        # The VmbPy callback only copies the frame into _pending_raw and requeues
+        # the buffer; the consumer thread converts and publishes it. Entries are
+        # (item, record) pairs. Outside recording only the newest frame is kept,
+        # and a frame replaced before the consumer gets to it is never converted.
+        # While recording, every frame is queued (up to RECORD_BACKLOG).
+        self._pending_raw: list = []
+        self._pending_lock: Lock = Lock()
+        self._pending_event: Event = Event()
+        self._consumer_stop: Event = Event()
+        self._consumer: Thread | None = None
+        self._dropped: int = 0
+        # Per-frame outcomes are counted in the callback and summarized
+        # periodically by the consumer instead of logging every frame
+        self._stats: dict[str, int] = {"ok": 0, "incomplete": 0, "error": 0}
+        self._stats_logged: dict[str, int] = dict(self._stats)
+        self._stream_error: Exception | None = None
+        self._convert = None  # Consumer-side conversion, set per stream by _make_converter()
+        self.realtime_cpus = realtime_cpus
+        # Shared-memory frame ring for viewers in other processes (see attach_shared_ring)
+        self.share_frames = share_frames
+        self._shm: shared_memory.SharedMemory | None = None
+        self._shm_seq: np.ndarray | None = None  # Per-slot sequence numbers in the shared block
+        self.frame_index_queue = (multiprocessing.Queue(maxsize=SHARED_INDEX_QUEUE_SIZE)
+                                  if share_frames else None)
+        self._rt_threads: set[int] = set()  # Native ids of threads already configured
+        self._saved_switch_interval: float | None = None  # Process value to restore after streaming
+        # Background image writers, started by initialize() or the first save_image() call
+        self._writer_q: queue.Queue | None = None
+        self._writers: list[Thread] = []
+        # Raw recording of every published frame into a memory-mapped file
+        self._rec_lock: Lock = Lock()
+        self._rec_path: str | None = None
+        self._rec_max_frames: int = 0
+        self._rec_mmap: np.memmap | None = None
+        self._rec_idx: int = 0
+        self._rec_active: bool = False  # Read by the callback: queue every frame for recording
+        self._rec_backlog: int = 0  # Frames queued for recording, not yet handled by the consumer
+        self._rec_skipped: int = 0  # Frames that arrived while recording but were not recorded
+        self._tj = None  # TurboJPEG encoder, created by the writer on first use (False if unusable)
         self._shutdown_requested: bool = False # Flag for cleanup
 
     def initialize(self) -> bool:
@@ -81,8 +207,15 @@ class VMPyCameraController:
             bool: True if camera was successfully initialized, False otherwise
         """
         if self.vmb is None:
-            logger.error("VmbSystem instance not available. Cannot initialize.")
-            return False
+            # Standalone use: no system context was injected, so open our own
+            try:
+                self.vmb = VmbSystem.get_instance()
+                self.vmb.__enter__()
+                self._owns_vmb = True
+            except Exception as e:
+                logger.error(f"VmbSystem instance not available. Cannot initialize: {e}")
+                self.vmb = None
+                return False
         if self.camera is not None:
             logger.warning("Camera already initialized.")
             return True
@@ -125,7 +258,9 @@ class VMPyCameraController:
             except Exception as e:
                 logger.warning(f"Could not set access mode {self.access_mode}: {e}. Using camera default.")
 
-            with self.camera as cam:
+            self._cam = self.camera.__enter__()
+            with self._cam_lock:
+                cam = self._cam
                 logger.info(f"Opened camera: {cam.get_id()}")
 
                 # --- Configuration ---
@@ -164,10 +299,12 @@ class VMPyCameraController:
                 except (VmbCameraError, AttributeError) as e:
                     logger.warning(f"Could not retrieve full camera info: {e}")
 
+            # Start the image writer now so the first save does not pay for it
+            self._start_writer()
+
             # If we reach here, initialization was successful.
-            # The camera object self.camera remains valid outside the 'with cam:' block
-            # until the outer 'with self.vmb:' block exits or release() is called.
-            # However, accessing features requires re-entering the camera context.
+            # The camera stays open until release() (or the outer 'with self.vmb:'
+            # block exits); other methods use self._cam directly.
             return True
 
         except VmbCameraError as e:
@@ -179,46 +316,466 @@ class VMPyCameraController:
             self._cleanup() # Clean up partial state
             return False
 
-    def _frame_handler(self, cam: Camera, stream, frame: Frame):
-        """Callback function executed for each incoming frame during async streaming. (VmbPy 1.1.0+ requires cam, stream, frame)"""
-        try:
-            if frame.get_status() == FrameStatus.Complete:
-                pf = frame.get_pixel_format()
-                from vmbpy import PixelFormat
-                if pf not in (PixelFormat.Bgr8, PixelFormat.Mono8):
-                    try:
-                        opencv_frame = frame.convert_pixel_format(PixelFormat.Bgr8).as_opencv_image()
-                    except Exception as e:
-                        logger.error(f"Failed to convert frame to Bgr8: {e}")
-                        opencv_frame = None
+    def _make_handler(self, pixel_format):
+        """
+        Build the frame callback for a stream in the given pixel format.
+
+        The pixel format is fixed while streaming, so the format dispatch is
+        done once here instead of on every frame, and the objects the callback
+        touches are bound as closure locals.
+
+        The returned callback runs on VmbPy's acquisition thread (VmbPy 1.1.0+
+        passes cam, stream, frame). It only copies the frame out of the driver
+        buffer, hands it to the consumer thread and requeues the buffer.
+        """
+        # FrameStatus is an IntEnum: compare the status against plain ints
+        complete = int(FrameStatus.Complete)
+        incomplete = int(FrameStatus.Incomplete)
+        stats = self._stats
+        pending_lock = self._pending_lock
+        pending_event = self._pending_event
+        queue_frame = self._cam.queue_frame
+        realtime_cpus = self.realtime_cpus
+        rt_threads = self._rt_threads
+
+        if pixel_format in (PixelFormat.Mono8, PixelFormat.Bgr8) or self._bayer_code(pixel_format) is not None:
+            # OpenCV-compatible or debayered by OpenCV in the consumer: a plain
+            # copy of the buffer is enough
+            def extract(frame):
+                return frame.as_numpy_ndarray().copy()
+        else:
+            # Needs conversion: keep an owned copy of the frame so the
+            # consumer can convert it after the buffer is requeued
+            extract = copy.deepcopy
+
+        def handler(cam: Camera, stream, frame: Frame):
+            try:
+                if realtime_cpus is not None and get_native_id() not in rt_threads:
+                    self._apply_realtime(realtime_cpus[0], ACQUISITION_RT_PRIORITY)
+                status = frame.get_status()
+                if status == complete:
+                    stats["ok"] += 1
+                    item = extract(frame)
+                    with pending_lock:
+                        pending = self._pending_raw
+                        if self._rec_active:
+                            # Recording: keep every frame, never coalesce
+                            if self._rec_backlog >= RECORD_BACKLOG:
+                                self._rec_skipped += 1
+                            else:
+                                self._rec_backlog += 1
+                                pending.append((item, True))
+                        else:
+                            if pending:
+                                self._dropped += len(pending)  # Superseded before they were converted
+                                pending.clear()
+                            pending.append((item, False))
+                    pending_event.set()
+                elif status == incomplete:
+                    stats["incomplete"] += 1
                 else:
-                    opencv_frame = frame.as_opencv_image()
-                if opencv_frame is not None:
-                    with self.frame_lock:
-                        self.current_frame = opencv_frame
-                    # Notify the GUI widget if possible
-                    try:
-                        parent = getattr(self, 'parent_widget', None)
-                        if parent and hasattr(parent, 'notify_new_frame'):
-                            logger.debug('Emitting new frame to GUI via notify_new_frame.')
-                            parent.notify_new_frame(opencv_frame)
-                    except Exception as e:
-                        logger.error(f"Error notifying GUI of new frame: {e}")
-            elif frame.get_status() == FrameStatus.Incomplete:
-                logger.warning(f"Received incomplete frame: {frame.get_status()}")
-            else:
-                logger.error(f"Received frame with error status: {frame.get_status()}")
+                    stats["error"] += 1
+            except Exception as e:
+                logger.error(f"Error processing frame in callback: {e}", exc_info=True)
+            finally:
+                try:
+                    queue_frame(frame)
+                except VmbCameraError as e:
+                    # Stopping the stream from inside the callback can deadlock;
+                    # flag the error and let the consumer thread stop it
+                    logger.error(f"Error requeuing frame: {e}. Stopping stream.")
+                    self._stream_error = e
+                except Exception as e:
+                    logger.error(f"Unexpected error requeuing frame: {e}", exc_info=True)
+
+        return handler
+
+    @staticmethod
+    def _bayer_code(pixel_format):
+        """OpenCV debayer conversion code for an 8-bit Bayer format, or None."""
+        codes = {
+            getattr(PixelFormat, 'BayerRG8', None): cv2.COLOR_BayerRGGB2BGR,
+            getattr(PixelFormat, 'BayerGB8', None): cv2.COLOR_BayerGBRG2BGR,
+            getattr(PixelFormat, 'BayerGR8', None): cv2.COLOR_BayerGRBG2BGR,
+            getattr(PixelFormat, 'BayerBG8', None): cv2.COLOR_BayerBGGR2BGR,
+        }
+        codes.pop(None, None)
+        return codes.get(pixel_format)
+
+    def _make_converter(self, pixel_format):
+        """
+        Build the consumer-side conversion to an OpenCV (Mono8/BGR8) image for
+        the items the handler from _make_handler() produces for this format.
+        """
+        if pixel_format in (PixelFormat.Mono8, PixelFormat.Bgr8):
+            return lambda item: item
+        bayer_code = self._bayer_code(pixel_format)
+        if bayer_code is not None:
+            # OpenCV's debayer is a single vectorized pass over the raw buffer
+            return lambda item: cv2.cvtColor(item, bayer_code)
+        return lambda item: item.convert_pixel_format(PixelFormat.Bgr8).as_opencv_image()
+
+    def _consume_loop(self):
+        """Consumer thread: convert the pending frames, publish them and notify the GUI."""
+        if self.realtime_cpus is not None:
+            self._apply_realtime(self.realtime_cpus[1], CONSUMER_RT_PRIORITY)
+        next_stats = time.monotonic() + STATS_INTERVAL
+        while not self._consumer_stop.is_set():
+            if time.monotonic() >= next_stats:
+                self._log_stats()
+                next_stats = time.monotonic() + STATS_INTERVAL
+            if self._stream_error is not None:
+                self.stop_stream()
+                break
+            if not self._pending_event.wait(timeout=0.5):
+                continue
+            self._pending_event.clear()
+            with self._pending_lock:
+                items = self._pending_raw
+                self._pending_raw = []
+            # A recording backlog is converted and recorded in order, but only
+            # the newest frame is published to viewers
+            last = len(items) - 1
+            for i, (item, record) in enumerate(items):
+                self._process_frame(item, record, publish=i == last)
+
+    def _process_frame(self, item, record: bool, publish: bool = True):
+        """
+        Convert one pending frame, record it if it was queued for that, and
+        publish it to viewers.
+        """
+        try:
+            try:
+                opencv_frame = self._convert(item)
+            except Exception as e:
+                logger.error(f"Failed to convert frame to Bgr8: {e}")
+                return
+            if record:
+                self._record_frame(opencv_frame)
+                record = False
+            if not publish:
+                return
+            published = self._publish_frame(opencv_frame)
+            # Notify the GUI widget if possible
+            try:
+                parent = getattr(self, 'parent_widget', None)
+                if parent and hasattr(parent, 'notify_new_frame'):
+                    logger.debug('Emitting new frame to GUI via notify_new_frame.')
+                    parent.notify_new_frame(self._read_only_view(published))
+            except Exception as e:
+                logger.error(f"Error notifying GUI of new frame: {e}")
+            loop = self._loop
+            if loop is not None:
+                try:
+                    loop.call_soon_threadsafe(self._offer_frame, self._read_only_view(published))
+                except RuntimeError:
+                    self._loop = None  # Event loop closed
         except Exception as e:
-            logger.error(f"Error processing frame in callback: {e}", exc_info=True)
+            logger.error(f"Error processing frame in consumer: {e}", exc_info=True)
         finally:
+            if record:
+                self._record_frame(None)  # Queued for recording but never converted
+
+    def _log_stats(self):
+        """Log a summary of frame outcomes if anything changed since the last one."""
+        stats = dict(self._stats)
+        last = self._stats_logged
+        if stats == last:
+            return
+        self._stats_logged = stats
+        if stats["incomplete"] != last["incomplete"] or stats["error"] != last["error"]:
+            logger.warning("Frame counts: ok=%d incomplete=%d error=%d",
+                           stats["ok"], stats["incomplete"], stats["error"])
+        else:
+            logger.debug("Frame counts: ok=%d incomplete=%d error=%d",
+                         stats["ok"], stats["incomplete"], stats["error"])
+
+    def attach_event_loop(self, loop: asyncio.AbstractEventLoop | None = None) -> asyncio.Queue:
+        """
+        Deliver streamed frames to an asyncio event loop.
+
+        Each published frame is offered to frame_queue (maxsize 1) on the loop's
+        thread, replacing a frame the coroutine has not taken yet, so
+        `frame = await controller.frame_queue.get()` always yields the newest
+        frame. Frames are read-only views on ring slots; copy any frame kept for
+        longer than RING_SIZE frames.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): Loop to deliver to. Defaults to the
+                running loop, so call this from a coroutine when omitted.
+
+        Returns:
+            asyncio.Queue: The frame queue (also available as frame_queue)
+        """
+        self._loop = loop if loop is not None else asyncio.get_running_loop()
+        self.frame_queue = asyncio.Queue(maxsize=1)
+        return self.frame_queue
+
+    def detach_event_loop(self):
+        """Stop delivering frames to the asyncio event loop."""
+        self._loop = None
+        self.frame_queue = None
+
+    def _offer_frame(self, frame: np.ndarray):
+        """Put a frame on frame_queue, dropping the older one (runs on the event loop)."""
+        frame_queue = self.frame_queue
+        if frame_queue is None:
+            return
+        if frame_queue.full():
+            frame_queue.get_nowait()
+        frame_queue.put_nowait(frame)
+
+    def _apply_realtime(self, cpu: int, priority: int):
+        """
+        Pin the calling thread to a CPU and give it SCHED_FIFO priority.
+
+        Keeps GC pauses and scheduler jitter elsewhere in the process from
+        delaying buffer requeues long enough for the camera to overrun its
+        buffers. Failures (no permission, non-Linux) are logged and ignored.
+        """
+        self._rt_threads.add(get_native_id())
+        if not hasattr(os, 'sched_setaffinity'):
+            logger.warning("Real-time thread scheduling is not supported on this platform.")
+            return
+        name = current_thread().name
+        try:
+            os.sched_setaffinity(0, {cpu})  # 0 = the calling thread
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+            logger.info(f"Thread {name} pinned to CPU {cpu} with SCHED_FIFO priority {priority}.")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not apply real-time scheduling to thread {name}: {e}")
+
+    def _publish_frame(self, src: np.ndarray) -> np.ndarray:
+        """Copy a frame into the next ring slot and make it the current frame."""
+        ring = self._ring
+        if ring is None or ring[0].shape != src.shape or ring[0].dtype != src.dtype:
+            # First frame or format change: (re)allocate the ring
+            if self.share_frames:
+                ring = self._allocate_shared_ring(src.shape, src.dtype)
+            else:
+                ring = [np.empty(src.shape, src.dtype) for _ in range(RING_SIZE)]
+            self._ring = ring
+            self._write_idx = 0
+        index = self._write_idx % RING_SIZE
+        slot = ring[index]
+        seq = self._frame_seq + 1  # Only the consumer thread changes _frame_seq
+        shm_seq = self._shm_seq
+        if shm_seq is not None:
+            shm_seq[index] = -1  # Seqlock: readers of this slot retry or skip while it is written
+        slot.flags.writeable = True
+        np.copyto(slot, src)
+        slot.flags.writeable = False  # Published frames are shared, never mutated by readers
+        if shm_seq is not None:
+            shm_seq[index] = seq
+        # Only the consumer thread writes; single attribute stores are atomic,
+        # so readers need no lock
+        self.current_frame = slot
+        self._write_idx += 1
+        with self._frame_cond:
+            self._frame_seq = seq
+            self._frame_cond.notify_all()
+        if self.frame_index_queue is not None:
+            # Only the slot location crosses the process boundary, never the pixels
+            entry = (self._shm.name, src.shape, src.dtype.str, index, seq)
             try:
-                cam.queue_frame(frame)
-            except VmbCameraError as e:
-                logger.error(f"Error requeuing frame: {e}. Stopping stream.")
-                self.stop_stream()
+                self.frame_index_queue.put_nowait(entry)
+            except queue.Full:
+                # Viewer is behind: drop the oldest index so it moves on to newer frames
+                try:
+                    self.frame_index_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                try:
+                    self.frame_index_queue.put_nowait(entry)
+                except queue.Full:
+                    pass
+        return slot
+
+    def _allocate_shared_ring(self, shape, dtype) -> list[np.ndarray]:
+        """
+        Create the shared-memory block for the ring and return views on its slots.
+
+        The block starts with SHARED_HEADER_BYTES holding one int64 sequence
+        number per slot (0 = never written, -1 = being written), followed by
+        the RING_SIZE frame slots.
+        """
+        self._free_shared_ring()
+        slot_bytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        self._shm = shared_memory.SharedMemory(create=True,
+                                               size=SHARED_HEADER_BYTES + RING_SIZE * slot_bytes)
+        self._shm_seq = np.ndarray((RING_SIZE,), np.int64, buffer=self._shm.buf)
+        self._shm_seq[:] = 0
+        logger.info(f"Shared frame ring '{self._shm.name}': {RING_SIZE} x {shape} {np.dtype(dtype)}")
+        return [np.ndarray(shape, dtype, buffer=self._shm.buf,
+                           offset=SHARED_HEADER_BYTES + i * slot_bytes)
+                for i in range(RING_SIZE)]
+
+    def _free_shared_ring(self):
+        """Unlink the shared-memory ring, if any."""
+        shm = self._shm
+        if shm is None:
+            return
+        self._shm = None
+        self._shm_seq = None
+        self._ring = None
+        self.current_frame = None
+        try:
+            shm.close()
+        except BufferError:
+            # Frames handed out earlier still reference the block; it is freed
+            # once they are garbage collected
+            pass
+        shm.unlink()
+
+    def start_recording(self, path: str, max_frames: int) -> bool:
+        """
+        Record every streamed frame, uncompressed, into a memory-mapped file.
+
+        The file is created when the first frame arrives (its shape and dtype
+        come from that frame) and holds up to max_frames frames. Frames after
+        that are not recorded. Call stop_recording() to finish the file.
+
+        While recording, frames are not coalesced: each one is queued for the
+        consumer. If the consumer falls RECORD_BACKLOG frames behind, further
+        frames are not recorded until it catches up; the sidecar reports them
+        as skipped_frames.
+
+        Args:
+            path (str): Raw output file; a '<path>.json' sidecar describes its layout
+            max_frames (int): Capacity of the file in frames
+
+        Returns:
+            bool: True if recording was armed, False otherwise
+        """
+        if max_frames <= 0:
+            logger.error(f"Invalid max_frames for recording: {max_frames}")
+            return False
+        with self._rec_lock:
+            if self._rec_path is not None:
+                logger.error(f"Already recording to {self._rec_path}.")
+                return False
+            self._rec_path = path
+            self._rec_max_frames = max_frames
+            self._rec_mmap = None
+            self._rec_idx = 0
+        with self._pending_lock:
+            self._rec_skipped = 0
+            self._rec_active = True
+        logger.info(f"Recording up to {max_frames} frames to {path}")
+        return True
+
+    def _record_frame(self, frame: np.ndarray | None):
+        """
+        Append a frame queued for recording to the file (consumer thread).
+
+        Args:
+            frame (np.ndarray | None): Converted frame, or None if the frame was
+                lost before it could be converted (counted as skipped)
+        """
+        written = frame is not None and self._write_recorded_frame(frame)
+        # The callback updates these counters too, under the same lock
+        with self._pending_lock:
+            self._rec_backlog -= 1
+            if not written:
+                self._rec_skipped += 1
+
+    def _write_recorded_frame(self, frame: np.ndarray) -> bool:
+        """Copy a frame into the recording file; False if it was not recorded."""
+        with self._rec_lock:
+            if self._rec_path is None or self._rec_idx >= self._rec_max_frames:
+                return False
+            try:
+                if self._rec_mmap is None:
+                    self._rec_mmap = np.memmap(self._rec_path, dtype=frame.dtype, mode='w+',
+                                               shape=(self._rec_max_frames,) + frame.shape)
+                elif self._rec_mmap.shape[1:] != frame.shape or self._rec_mmap.dtype != frame.dtype:
+                    logger.error("Frame format changed during recording; frame not recorded.")
+                    return False
+                np.copyto(self._rec_mmap[self._rec_idx], frame)
+                self._rec_idx += 1
+                if self._rec_idx == self._rec_max_frames:
+                    logger.warning(f"Recording file full ({self._rec_max_frames} frames); "
+                                   "further frames are not recorded.")
+                    self._rec_active = False  # Back to showing only the newest frame
+                return True
             except Exception as e:
-                logger.error(f"Unexpected error requeuing frame: {e}", exc_info=True)
+                logger.error(f"Error recording frame to {self._rec_path}: {e}", exc_info=True)
+                self._rec_max_frames = self._rec_idx  # Stop recording further frames
+                self._rec_active = False
+                return False
+
+    def stop_recording(self, timeout: float = 2.0) -> bool:
+        """
+        Finish the recording: flush the file and write its '<path>.json' sidecar.
+
+        Frames already queued for recording are written first, waiting up to
+        timeout seconds for the consumer; any left after that count as skipped.
+
+        Returns:
+            bool: True if a recording was finished successfully, False otherwise
+        """
+        self._rec_active = False
+        deadline = time.monotonic() + timeout
+        while self._rec_backlog > 0 and self._consumer is not None and time.monotonic() < deadline:
+            time.sleep(0.005)
+        with self._rec_lock:
+            path, mm, frames = self._rec_path, self._rec_mmap, self._rec_idx
+            self._rec_path = None
+            self._rec_mmap = None
+        with self._pending_lock:
+            # Frames still queued will find the recording closed and are not written
+            skipped = self._rec_skipped + self._rec_backlog
+        if path is None:
+            logger.warning("Not recording.")
+            return False
+        if mm is None:
+            logger.warning(f"No frames were recorded to {path}.")
+            return False
+        try:
+            mm.flush()
+            info = {
+                "frames": frames,
+                "skipped_frames": skipped,
+                "max_frames": mm.shape[0],
+                "frame_shape": list(mm.shape[1:]),
+                "dtype": mm.dtype.str,
+            }
+            del mm
+            with open(f"{path}.json", 'w') as f:
+                json.dump(info, f, indent=2)
+            if skipped:
+                logger.warning(f"Recorded {frames} frames to {path}; {skipped} frames were not recorded.")
+            else:
+                logger.info(f"Recorded {frames} frames to {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error finishing recording {path}: {e}", exc_info=True)
+            return False
+
+    def get_last_n(self, n: int) -> list[np.ndarray]:
+        """
+        Get up to the n most recent streamed frames, oldest first.
+
+        Returns read-only views on the ring slots. A slot is overwritten
+        RING_SIZE frames after it was published, so copy frames that are kept.
+
+        Args:
+            n (int): Number of frames wanted; at most RING_SIZE are returned.
+        """
+        ring = self._ring
+        written = self._write_idx
+        if ring is None or n <= 0:
+            return []
+        count = min(n, written, RING_SIZE)
+        return [self._read_only_view(ring[i % RING_SIZE])
+                for i in range(written - count, written)]
 
+    @staticmethod
+    def _read_only_view(frame: np.ndarray) -> np.ndarray:
+        """Return a non-writeable view on a frame buffer."""
+        view = frame.view()
+        view.flags.writeable = False
+        return view
 
     def start_stream(self) -> bool:
         """Start asynchronous frame acquisition using VmbPy's streaming API."""
@@ -229,23 +786,78 @@ class VMPyCameraController:
             logger.error("Camera not initialized. Cannot start stream.")
             return False
 
+        # Start the consumer before frames can arrive
+        if self.realtime_cpus is not None:
+            # Shorter GIL switch interval so the callback thread wakes sooner;
+            # this is process-wide, so the previous value is restored on stop
+            if self._saved_switch_interval is None:
+                self._saved_switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(0.001)
+            self._rt_threads.clear()
+        self._stream_error = None
+        self._dropped = 0
+        self._stats = {"ok": 0, "incomplete": 0, "error": 0}
+        self._stats_logged = dict(self._stats)
+        self._pending_raw = []
+        self._pending_event.clear()
+        self._consumer_stop.clear()
+        self._consumer = Thread(target=self._consume_loop, name="VmbFrameConsumer", daemon=True)
+        self._consumer.start()
+
         try:
-            # Re-enter camera context to access streaming methods
-            with self.camera as cam:
+            with self._cam_lock:
+                cam = self._cam
+                # Specialize the callback for the format the camera will deliver
+                try:
+                    stream_format = cam.get_pixel_format()
+                except VmbCameraError:
+                    stream_format = self.pixel_format
+                handler = self._make_handler(stream_format)
+                self._convert = self._make_converter(stream_format)
                 logger.info("Starting asynchronous stream...")
-                cam.start_streaming(handler=self._frame_handler, buffer_count=DEFAULT_BUFFER_COUNT)
+                try:
+                    cam.start_streaming(handler=handler, buffer_count=DEFAULT_BUFFER_COUNT,
+                                        allocation_mode=self._allocation_mode)
+                except VmbCameraError as e:
+                    if self._allocation_mode == AllocationMode.AnnounceFrame:
+                        raise
+                    logger.warning(f"Transport layer buffer allocation not supported ({e}). "
+                                   "Falling back to VmbPy-allocated buffers.")
+                    self._allocation_mode = AllocationMode.AnnounceFrame
+                    cam.start_streaming(handler=handler, buffer_count=DEFAULT_BUFFER_COUNT,
+                                        allocation_mode=self._allocation_mode)
                 self.is_running = True
                 logger.info("Asynchronous stream started.")
                 return True
         except VmbCameraError as e:
             logger.error(f"Vimba specific error starting stream: {e}")
             self.is_running = False
+            self._stop_consumer()
             return False
         except Exception as e:
             logger.error(f"Unexpected error starting stream: {e}", exc_info=True)
             self.is_running = False
+            self._stop_consumer()
             return False
 
+    def _stop_consumer(self):
+        """Signal the consumer thread to exit and wait for it."""
+        consumer = self._consumer
+        self._consumer = None
+        if consumer is None:
+            return
+        self._consumer_stop.set()
+        self._pending_event.set()  # Wake it if it is waiting for a frame
+        if consumer is not current_thread():
+            consumer.join(timeout=2.0)
+        self._restore_switch_interval()
+
+    def _restore_switch_interval(self):
+        """Undo the GIL switch interval change made by a realtime start_stream()."""
+        if self._saved_switch_interval is not None:
+            sys.setswitchinterval(self._saved_switch_interval)
+            self._saved_switch_interval = None
+
     def stop_stream(self) -> bool:
         """Stop the asynchronous frame acquisition."""
         if not self.is_running:
@@ -258,15 +870,9 @@ class VMPyCameraController:
         logger.info("Stopping asynchronous stream...")
         self.is_running = False # Set flag early
         try:
-            # Re-enter camera context to access streaming methods
-            with self.camera as cam:
-                # cam.stop_streaming() should be called automatically when exiting
-                # the 'with cam:' block where start_streaming was called,
-                # but explicit call is safer for clarity and immediate effect.
-                # However, VmbPy examples suggest it's handled by context exit.
-                # Let's try relying on the context manager first.
-                # If issues arise, uncomment the line below.
-                cam.stop_streaming() # Explicit stop
+            with self._cam_lock:
+                cam = self._cam
+                cam.stop_streaming()
                 logger.info("Asynchronous stream stopped.")
 
         except VmbCameraError as e:
@@ -277,33 +883,52 @@ class VMPyCameraController:
             logger.error(f"Unexpected error stopping stream: {e}", exc_info=True)
             return False
         finally:
-            # Clear the last frame when stopping
-            with self.frame_lock:
-                self.current_frame = None
+            self._stop_consumer()
+            with self._frame_cond:
+                self._frame_cond.notify_all()  # Release wait_for_frame() callers
+            self._log_stats()
+            if self._dropped:
+                logger.info(f"Skipped converting {self._dropped} frames superseded before the consumer reached them.")
+            # Clear the last frame (and the ring history) when stopping; the
+            # consumer has exited, so nothing else writes these any more
+            self.current_frame = None
+            self._write_idx = 0
 
         return True
 
 
     def capture_frame(self) -> np.ndarray | None:
-        """Capture a single frame synchronously."""
-        if self.is_running:
-            logger.warning("Capturing single frame while streaming is active. Consider stopping stream first.")
-            # Return the latest streamed frame instead?
-            # return self.get_current_frame()
+        """
+        Capture a single frame synchronously.
+
+        While streaming, returns a copy of the latest streamed frame instead of
+        asking the camera for another one (a single-frame acquisition cannot run
+        alongside the stream).
+        """
         if not self.camera:
             logger.error("Camera not initialized. Cannot capture frame.")
             return None
+        if self.is_running:
+            frame = self.current_frame
+            if frame is None:
+                logger.warning("Streaming is active but no frame has been received yet.")
+                return None
+            return frame.copy()
 
         logger.info("Capturing single frame...")
         try:
-            with self.camera as cam:
-                frame = cam.get_frame(timeout_ms=2000) # 2-second timeout
-                logger.info(f"Single frame received with status: {frame.get_status()}")
-                if frame.get_status() == FrameStatus.Complete:
-                    return frame.as_opencv_image()
-                else:
-                    logger.error(f"Failed to capture complete frame: {frame.get_status()}")
-                    return None
+            with self._cam_lock:
+                cam = self._cam
+            # Don't hold _cam_lock while waiting for the frame: VmbPy's ctypes call
+            # releases the GIL, so feature polling from other threads keeps running
+            frame = cam.get_frame(timeout_ms=2000) # 2-second timeout
+            status = frame.get_status()
+            logger.info(f"Single frame received with status: {status}")
+            if status == FrameStatus.Complete:
+                return frame.as_opencv_image()
+            else:
+                logger.error(f"Failed to capture complete frame: {status}")
+                return None
         except VmbCameraError as e:
             logger.error(f"Vimba specific error capturing frame: {e}")
             return None
@@ -311,17 +936,98 @@ class VMPyCameraController:
             logger.error(f"Unexpected error capturing frame: {e}", exc_info=True)
             return None
 
-    def get_current_frame(self) -> np.ndarray | None:
-        """Get the most recent frame captured during asynchronous streaming."""
-        with self.frame_lock:
-            if self.current_frame is None:
+    def get_current_frame(self, as_bgr: bool = False) -> np.ndarray | None:
+        """
+        Get a copy of the most recent frame captured during asynchronous streaming.
+
+        The copy is writeable and stays valid indefinitely. Read-only callers
+        should use peek_current_frame() to avoid the copy.
+
+        Args:
+            as_bgr (bool): Convert single-channel (Mono8) frames to 3-channel BGR,
+                e.g. for consumers that require colour input. Defaults to False.
+        """
+        frame = self.peek_current_frame(as_bgr)
+        if frame is None:
+            return None
+        return np.array(frame, copy=True, order='C')
+
+    @property
+    def frame_sequence(self) -> int:
+        """Number of frames published so far; changes whenever a new frame is available."""
+        return self._frame_seq
+
+    def wait_for_frame(self, timeout: float = 1.0) -> np.ndarray | None:
+        """
+        Block until the next frame is published and return it.
+
+        Paces a polling loop by the camera's frame rate instead of a sleep.
+
+        Args:
+            timeout (float): Maximum time to wait in seconds
+
+        Returns:
+            np.ndarray: Read-only view on the new frame (see peek_current_frame),
+                or None on timeout or when streaming stops
+        """
+        with self._frame_cond:
+            seq = self._frame_seq
+            self._frame_cond.wait_for(lambda: self._frame_seq != seq or not self.is_running,
+                                      timeout=timeout)
+            if self._frame_seq == seq:
                 return None
-            # Return a copy to prevent external modification of the internal buffer
-            return self.current_frame.copy()
+        return self.peek_current_frame()
 
-    def save_image(self, filepath: str, frame: np.ndarray | None = None) -> bool:
-        """Save the current or a provided frame to a file."""
-        img_to_save = frame if frame is not None else self.get_current_frame()
+    def peek_current_frame(self, as_bgr: bool = False) -> np.ndarray | None:
+        """
+        Get a read-only view on the most recent frame, without copying.
+
+        The underlying slot is reused RING_SIZE frames later, so callers that
+        keep the frame around longer must copy it themselves.
+
+        Args:
+            as_bgr (bool): Present single-channel (Mono8) frames as 3-channel BGR
+                (a broadcast view, still without copying). Defaults to False.
+        """
+        frame = self.current_frame
+        if frame is None:
+            return None
+        if as_bgr and (frame.ndim == 2 or frame.shape[2] == 1):
+            return self._gray_to_bgr_view(frame)
+        return self._read_only_view(frame)
+
+    @staticmethod
+    def _gray_to_bgr_view(gray: np.ndarray) -> np.ndarray:
+        """
+        Present a single-channel frame as 3-channel BGR without copying.
+
+        The result is a read-only broadcast view (all three channels share the
+        same memory); use np.ascontiguousarray() where a real BGR buffer is needed.
+        """
+        gray2d = gray.reshape(gray.shape[:2])
+        return np.broadcast_to(gray2d[..., None], gray2d.shape + (3,))
+
+    def save_image(self, filepath: str, frame: np.ndarray | None = None,
+                   on_done: Callable[[str, bool], None] | None = None) -> bool:
+        """
+        Save the current or a provided frame to a file.
+
+        The frame is handed to a background writer thread, so this returns
+        before the image is encoded and on disk. Ring slots and other read-only
+        or strided views are copied first; a writeable contiguous array passed
+        in is written as is and must not be modified until the save finishes.
+
+        Args:
+            filepath (str): Destination path; the extension selects the format
+            frame (np.ndarray | None): Frame to save; None saves the current frame
+            on_done (callable, optional): Called as on_done(filepath, success) once
+                the write finished, failed or was dropped from a full queue. Runs
+                on a writer thread. Not called when this returns False.
+
+        Returns:
+            bool: True if the image was queued for writing, False otherwise
+        """
+        img_to_save = frame if frame is not None else self.peek_current_frame()
 
         if img_to_save is None:
             # Try capturing a single frame if not streaming and no frame provided
@@ -333,17 +1039,153 @@ class VMPyCameraController:
             logger.error("Cannot save image: No frame available.")
             return False
 
+        # Published ring slots (and views on them) are read-only and get reused,
+        # and broadcast BGR views are strided; only those need their own
+        # contiguous buffer. Caller-owned arrays are written without a copy
+        if not img_to_save.flags.writeable or not img_to_save.flags.c_contiguous:
+            img_to_save = np.array(img_to_save, copy=True, order='C')
+
+        self._start_writer()
+        item = (filepath, img_to_save, on_done)
         try:
-            success = cv2.imwrite(filepath, img_to_save)
-            if success:
-                logger.info(f"Image saved successfully to {filepath}")
-                return True
-            else:
-                logger.error(f"Failed to save image to {filepath} using OpenCV.")
+            self._writer_q.put_nowait(item)
+        except queue.Full:
+            # Keep the newest request: drop the oldest image still waiting
+            try:
+                dropped_path, _, dropped_done = self._writer_q.get_nowait()
+                self._writer_q.task_done()
+                logger.error(f"Image writer is behind; dropped pending save to {dropped_path}.")
+                self._notify_saved(dropped_done, dropped_path, False)
+            except queue.Empty:
+                pass
+            try:
+                self._writer_q.put_nowait(item)
+            except queue.Full:
+                logger.error(f"Cannot save image to {filepath}: writer queue is full.")
                 return False
-        except Exception as e:
-            logger.error(f"Error saving image: {e}", exc_info=True)
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until all images queued by save_image() are written.
+
+        Args:
+            timeout (float | None): Seconds to wait at most; None waits indefinitely
+
+        Returns:
+            bool: True if no saves are pending, False on timeout
+        """
+        write_queue = self._writer_q
+        if write_queue is None or not self._writers:
+            return True
+        if timeout is None:
+            write_queue.join()
+            return True
+        with write_queue.all_tasks_done:
+            return write_queue.all_tasks_done.wait_for(
+                lambda: write_queue.unfinished_tasks == 0, timeout=timeout)
+
+    def _start_writer(self):
+        """Start the background image writers if they are not running."""
+        if self._writers and all(w.is_alive() for w in self._writers):
+            return
+        self._stop_writer()
+        self._writer_q = queue.Queue(maxsize=WRITER_QUEUE_SIZE)
+        self._writers = [Thread(target=self._writer_loop, args=(self._writer_q,),
+                                name=f"ImageWriter-{i}", daemon=True)
+                         for i in range(WRITER_THREADS)]
+        for writer in self._writers:
+            writer.start()
+
+    def _stop_writer(self):
+        """Let the writers finish queued images, then stop them."""
+        writers = self._writers
+        self._writers = []
+        if not writers:
+            return
+        for _ in writers:
+            self._writer_q.put(None)  # One sentinel per writer, after any pending images
+        for writer in writers:
+            writer.join(timeout=10.0)
+
+    @staticmethod
+    def _imwrite_params(filepath: str) -> list:
+        """Encoder parameters for the file type, favouring speed."""
+        ext = os.path.splitext(filepath)[1].lower()
+        if ext == '.png':
+            # Run-length strategy: much cheaper than the default deflate search
+            return [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION,
+                    cv2.IMWRITE_PNG_STRATEGY, cv2.IMWRITE_PNG_STRATEGY_RLE]
+        if ext in ('.jpg', '.jpeg'):
+            return [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY]
+        return []
+
+    def _write_jpeg_turbo(self, filepath: str, image: np.ndarray) -> bool:
+        """
+        Write a .jpg/.jpeg file with TurboJPEG if it is installed.
+
+        Returns:
+            bool: True if the file was written, False if TurboJPEG does not apply
+                (not installed, not a JPEG path or unsupported image layout)
+        """
+        if TurboJPEG is None or self._tj is False or not filepath.lower().endswith(('.jpg', '.jpeg')):
             return False
+        if image.dtype != np.uint8 or image.ndim not in (2, 3):
+            return False
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        if channels == 1:
+            pixel_format, subsample = TJPF_GRAY, TJSAMP_GRAY
+        elif channels == 3:
+            pixel_format, subsample = TJPF_BGR, TJSAMP_420
+        else:
+            return False
+        if self._tj is None:
+            try:
+                self._tj = TurboJPEG()
+            except Exception as e:
+                # Python package present but the libturbojpeg library is not
+                logger.warning(f"TurboJPEG unavailable, using OpenCV for JPEG: {e}")
+                self._tj = False
+                return False
+        data = self._tj.encode(image, quality=JPEG_QUALITY, pixel_format=pixel_format,
+                               jpeg_subsample=subsample)
+        with open(filepath, 'wb') as f:
+            f.write(data)
+        return True
+
+    def _writer_loop(self, write_queue: queue.Queue):
+        """Encode and write queued images until the sentinel is received."""
+        while True:
+            item = write_queue.get()
+            if item is None:
+                write_queue.task_done()
+                break
+            filepath, image, on_done = item
+            success = False
+            try:
+                if self._write_jpeg_turbo(filepath, image):
+                    success = True
+                else:
+                    success = bool(cv2.imwrite(filepath, image, self._imwrite_params(filepath)))
+                if success:
+                    logger.info(f"Image saved successfully to {filepath}")
+                else:
+                    logger.error(f"Failed to save image to {filepath} using OpenCV.")
+            except Exception as e:
+                logger.error(f"Error saving image to {filepath}: {e}", exc_info=True)
+            finally:
+                self._notify_saved(on_done, filepath, success)
+                write_queue.task_done()
+
+    @staticmethod
+    def _notify_saved(on_done, filepath: str, success: bool):
+        """Report the outcome of a queued save to its on_done callback, if any."""
+        if on_done is None:
+            return
+        try:
+            on_done(filepath, success)
+        except Exception as e:
+            logger.error(f"Error in save_image callback for {filepath}: {e}", exc_info=True)
 
     def release(self):
         """Stop streaming and release camera resources."""
@@ -351,18 +1193,47 @@ class VMPyCameraController:
         self._shutdown_requested = True # Signal intent to shutdown
         if self.is_running:
             self.stop_stream()
+        self._stop_writer()
+        self._restore_switch_interval()
+        if self._rec_path is not None:
+            self.stop_recording()
+        self._free_shared_ring()
 
-        # The VmbSystem context manager handles VmbApiShutdown when its 'with' block exits.
-        # We don't manage VmbSystem context here directly after initialization.
-        # We primarily need to ensure the camera object is no longer used.
+        # An injected VmbSystem is shut down by its owner when its 'with' block
+        # exits; only the camera context opened in initialize() (and a system
+        # context initialize() entered itself) is closed here.
+        self._close_camera()
         self.camera = None # Allow garbage collection
-        self.vmb = None    # Release reference to VmbSystem
+        self._release_vmb()
         logger.info("Camera resources released.")
 
+    def _release_vmb(self):
+        """Drop the VmbSystem reference, exiting it only if initialize() entered it."""
+        if self._owns_vmb and self.vmb is not None:
+            try:
+                self.vmb.__exit__(None, None, None)
+            except Exception as e:
+                logger.warning(f"Error shutting down VmbSystem: {e}")
+        self._owns_vmb = False
+        self.vmb = None
+
+    def _close_camera(self):
+        """Exit the camera context entered in initialize(), if it is open."""
+        with self._cam_lock:
+            if self._cam is None:
+                return
+            self._cam = None
+            self._feature_cache.clear()
+            try:
+                self.camera.__exit__(None, None, None)
+            except Exception as e:
+                logger.warning(f"Error closing camera: {e}")
+
     def _cleanup(self):
         """Internal cleanup helper."""
+        self._close_camera()
         self.camera = None
-        self.vmb = None # Release VmbSystem reference
+        self._release_vmb()
 
     # Ensure cleanup on deletion
     # def __del__(self):
@@ -370,40 +1241,14 @@ class VMPyCameraController:
     #          logger.warning("VMPyCameraController deleted without explicit release(). Attempting cleanup.")
     #          self.release()
 
-    def _convert_frame_to_opencv(self, frame: Frame) -> np.ndarray | None:
-        """Convert VmbPy Frame to OpenCV compatible format (BGR8)."""
-        if not frame:
-            return None
-        try:
-            # as_opencv_image tries to convert to BGR8 by default
-            return frame.as_opencv_image()
-        except VmbCameraError as e:
-            logger.error(f"Error converting frame to OpenCV format: {e}")
-            # Fallback: try converting to numpy array first
-            try:
-                img_np = frame.as_numpy_ndarray()
-                # Manual conversion might be needed depending on source format
-                # Example: If Mono8
-                if frame.get_pixel_format() == PixelFormat.Mono8:
-                    return cv2.cvtColor(img_np, cv2.COLOR_GRAY2BGR)
-                # Add other conversions if necessary (e.g., RGB to BGR)
-                else:
-                    logger.warning(f"NumPy conversion succeeded, but format {frame.get_pixel_format()} requires manual OpenCV conversion.")
-                    return None # Or attempt conversion if format is known
-            except Exception as e_np:
-                logger.error(f"Fallback NumPy conversion also failed: {e_np}")
-                return None
-        except Exception as e_generic:
-            logger.error(f"Unexpected error during frame conversion: {e_generic}", exc_info=True)
-            return None
-
     def get_available_pixel_formats(self):
         """Get a list of pixel formats supported by the camera."""
         if not self.camera:
             logger.error("Camera not initialized. Cannot get pixel formats.")
             return []
         try:
-            with self.camera as cam:
+            with self._cam_lock:
+                cam = self._cam
                 formats = cam.get_pixel_formats()
                 return list(formats)  # Return enums, not strings
         except VmbCameraError as e:
@@ -419,7 +1264,8 @@ class VMPyCameraController:
             logger.error("Camera not initialized. Cannot save settings.")
             return False
         try:
-            with self.camera as cam:
+            with self._cam_lock:
+                cam = self._cam
                 cam.save_settings_to_xml(file_path)
                 logger.info(f"Camera settings saved to {file_path}")
                 return True
@@ -436,7 +1282,8 @@ class VMPyCameraController:
             logger.error("Camera not initialized. Cannot load settings.")
             return False
         try:
-            with self.camera as cam:
+            with self._cam_lock:
+                cam = self._cam
                 cam.load_settings_from_xml(file_path)
                 logger.info(f"Camera settings loaded from {file_path}")
                 # After loading settings, internal state like self.pixel_format might need update
@@ -460,8 +1307,9 @@ class VMPyCameraController:
             logger.error(f"Camera not initialized. Cannot get feature {feature_name}.")
             return None
         try:
-            with self.camera as cam:
-                feature = cam.get_feature_by_name(feature_name)
+            with self._cam_lock:
+                cam = self._cam
+                feature = self._get_feature(cam, feature_name)
                 return feature.get()
         except VmbCameraError as e:
             logger.error(f"Vimba error getting feature {feature_name}: {e}")
@@ -470,14 +1318,23 @@ class VMPyCameraController:
             logger.error(f"Error getting feature {feature_name}: {e}", exc_info=True)
             return None
 
+    def _get_feature(self, cam: Camera, feature_name: str):
+        """Look up a feature by name once and reuse the object on later calls."""
+        feature = self._feature_cache.get(feature_name)
+        if feature is None:
+            feature = cam.get_feature_by_name(feature_name)
+            self._feature_cache[feature_name] = feature
+        return feature
+
     def set_feature_value(self, feature_name: str, value) -> bool:
         """Set the value of a camera feature by its name."""
         if not self.camera:
             logger.error(f"Camera not initialized. Cannot set feature {feature_name}.")
             return False
         try:
-            with self.camera as cam:
-                feature = cam.get_feature_by_name(feature_name)
+            with self._cam_lock:
+                cam = self._cam
+                feature = self._get_feature(cam, feature_name)
                 feature.set(value)
                 logger.info(f"Set feature {feature_name} to {value}")
                 return True
@@ -488,6 +1345,59 @@ class VMPyCameraController:
             logger.error(f"Error setting feature {feature_name} to {value}: {e}", exc_info=True)
             return False
 
+def attach_shared_ring(name: str, shape, dtype) -> tuple[shared_memory.SharedMemory, list[np.ndarray], np.ndarray]:
+    """
+    Attach to a controller's shared frame ring from another process.
+
+    Slots are reused while the viewer reads them, so read frames through
+    read_shared_frame() rather than from the views directly.
+
+    Args:
+        name (str): Shared memory name, as posted on frame_index_queue
+        shape (tuple): Frame shape, as posted on frame_index_queue
+        dtype: Frame dtype (or its string form), as posted on frame_index_queue
+
+    Returns:
+        tuple: (SharedMemory, list of RING_SIZE read-only frame views, read-only
+            array of per-slot sequence numbers). Keep the SharedMemory object
+            alive while using the views, then close() it.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    slot_bytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    seqs = np.ndarray((RING_SIZE,), np.int64, buffer=shm.buf)
+    seqs.flags.writeable = False
+    ring = []
+    for i in range(RING_SIZE):
+        view = np.ndarray(shape, dtype, buffer=shm.buf, offset=SHARED_HEADER_BYTES + i * slot_bytes)
+        view.flags.writeable = False
+        ring.append(view)
+    return shm, ring, seqs
+
+def read_shared_frame(ring: list[np.ndarray], seqs: np.ndarray, slot: int, seq: int) -> np.ndarray | None:
+    """
+    Copy a frame out of an attached shared ring, checking it was not reused.
+
+    The slot's sequence number is checked before and after the copy
+    (a seqlock), so a frame that was overwritten or is being written is
+    rejected instead of returned torn.
+
+    Args:
+        ring (list): Frame views from attach_shared_ring
+        seqs (np.ndarray): Sequence numbers from attach_shared_ring
+        slot (int): Slot index, as posted on frame_index_queue
+        seq (int): Frame sequence number, as posted on frame_index_queue
+
+    Returns:
+        np.ndarray: A private copy of the frame, or None if the slot no longer
+            holds that frame (the viewer fell behind; take the next index)
+    """
+    if seqs[slot] != seq:
+        return None
+    frame = ring[slot].copy()
+    if seqs[slot] != seq:
+        return None
+    return frame
+
 # Example Usage (for testing)
 if __name__ == '__main__':
     logging.basicConfig(
@@ -523,7 +1433,8 @@ if __name__ == '__main__':
             start_time = time.time()
             frame_count = 0
             while True:
-                frame = controller.get_current_frame()
+                # Paced by the camera: returns as soon as the next frame is published
+                frame = controller.wait_for_frame(timeout=0.5)
                 if frame is not None:
                     cv2.imshow("Streaming Frame", frame)
                     key = cv2.waitKey(1) & 0xFF
@@ -535,8 +1446,6 @@ if __name__ == '__main__':
                         controller.save_image(filename, frame)
 
                     frame_count += 1
-                else:
-                    time.sleep(0.01) # Avoid busy-waiting if no frame yet
 
                 # Stop after 20 seconds for testing
                 if time.time() - start_time > 20:
@@ -15,6 +15,7 @@ from vmbpy import VmbSystem
 
 # Import project modules
 from src.gui.main_window import MainWindow
+from src.utils.error_handling import install_error_log_buffer, flush_error_log
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +27,8 @@ logging.basicConfig(
     ]
 )
 
+install_error_log_buffer()
+
 logger = logging.getLogger(__name__)
 
 def main():
@@ -53,6 +56,7 @@ def main():
     finally:
         # Exit VmbSystem context on app exit
         vmb.__exit__(None, None, None)
+        flush_error_log()
     return result
 
 if __name__ == "__main__":
@@ -6,15 +6,57 @@ including custom exceptions, error logging, and helper functions for consistent
 error handling across all hardware controllers.
 """
 
+import atexit
 import logging
-import traceback
+import logging.handlers
 import functools
+import threading
 from enum import Enum, auto
-from typing import Optional, Callable, Any, Dict, Type, Union
+from types import MappingProxyType
+from typing import Optional, Callable, Any, Dict, Mapping, Tuple, Type, Union
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Hardware errors can be raised in tight retry loops; low-severity records can
+# be buffered and handed to the application's handlers in batches
+ERROR_LOG_CAPACITY = 256
+
+class _PropagateHandler(logging.Handler):
+    """Hand buffered records to the ancestors of this module's logger."""
+
+    def emit(self, record):
+        # Same path as normal propagation, including intermediate loggers
+        # and their propagate flags, resolved at flush time
+        if logger.parent is not None:
+            logger.parent.callHandlers(record)
+
+def install_error_log_buffer(capacity: int = ERROR_LOG_CAPACITY) -> None:
+    """
+    Buffer INFO records from hardware errors; WARNING and above flush at once.
+    
+    Call this after logging has been configured. Installing twice is a no-op.
+    
+    Args:
+        capacity (int, optional): Number of records held before they are written
+    """
+    if any(isinstance(h, logging.handlers.MemoryHandler) for h in logger.handlers):
+        return
+    logger.addHandler(logging.handlers.MemoryHandler(
+        capacity=capacity,
+        flushLevel=logging.WARNING,
+        target=_PropagateHandler()
+    ))
+    # Records reach the ancestor handlers through the buffer instead
+    logger.propagate = False
+
+def flush_error_log() -> None:
+    """Write out any hardware error records still held in the buffer."""
+    for handler in logger.handlers:
+        handler.flush()
+
+atexit.register(flush_error_log)
+
 class ErrorSeverity(Enum):
     """Enumeration for error severity levels."""
     INFO = auto()       # Informational, non-critical errors
@@ -33,6 +75,90 @@ class HardwareErrorType(Enum):
     HARDWARE = auto()       # Hardware-specific errors (device malfunction)
     UNKNOWN = auto()        # Unknown errors
 
+# Severity -> logging call, built once instead of an if/elif chain per error
+_SEVERITY_DISPATCH: Dict[ErrorSeverity, Callable[[str], None]] = {
+    ErrorSeverity.INFO: logger.info,
+    ErrorSeverity.WARNING: logger.warning,
+    ErrorSeverity.ERROR: logger.error,
+    ErrorSeverity.CRITICAL: logger.critical,
+    ErrorSeverity.FATAL: lambda msg: logger.critical(f"FATAL: {msg}"),
+}
+# Severity -> logging level, for checking whether a record would be emitted
+_SEVERITY_TO_LOGLEVEL: Dict[ErrorSeverity, int] = {
+    ErrorSeverity.INFO: logging.INFO,
+    ErrorSeverity.WARNING: logging.WARNING,
+    ErrorSeverity.ERROR: logging.ERROR,
+    ErrorSeverity.CRITICAL: logging.CRITICAL,
+    ErrorSeverity.FATAL: logging.CRITICAL,
+}
+# Severities at or above this value also log the original exception's traceback
+_ERROR_SEVERITY_VALUE = ErrorSeverity.ERROR.value
+# Severities at or above this value are never suppressed as repeats
+_CRITICAL_SEVERITY_VALUE = ErrorSeverity.CRITICAL.value
+
+def _format_hardware_error(
+    device_upper: str,
+    error_type: HardwareErrorType,
+    message: str,
+    original_exception: Optional[Exception] = None
+) -> str:
+    """
+    Build the message used both as HardwareError text and as its log record.
+    
+    Args:
+        device_upper (str): Upper-cased device type (e.g., "CAMERA")
+        error_type (HardwareErrorType): Type of error that occurred
+        message (str): Error message
+        original_exception (Exception, optional): Original exception that caused the failure
+        
+    Returns:
+        str: Formatted error message
+    """
+    full_message = f"[{device_upper}] {error_type.name} error: {message}"
+    if original_exception:
+        full_message += f" (Caused by: {type(original_exception).__name__}: {str(original_exception)})"
+    return full_message
+
+def _log_hardware_failure(
+    device_upper: str,
+    error_type: HardwareErrorType,
+    severity: ErrorSeverity,
+    message: str,
+    original_exception: Optional[Exception] = None
+) -> None:
+    """
+    Log a hardware failure the way HardwareError does, without creating one.
+    
+    Args:
+        device_upper (str): Upper-cased device type (e.g., "CAMERA")
+        error_type (HardwareErrorType): Type of error that occurred
+        severity (ErrorSeverity): Severity level of the error
+        message (str): Error message
+        original_exception (Exception, optional): Original exception that caused the failure
+    """
+    # Skip formatting entirely when the logger would drop the record
+    if not logger.isEnabledFor(_SEVERITY_TO_LOGLEVEL[severity]):
+        return
+    
+    _emit_hardware_failure(
+        severity,
+        _format_hardware_error(device_upper, error_type, message, original_exception),
+        original_exception
+    )
+
+def _emit_hardware_failure(
+    severity: ErrorSeverity,
+    log_message: str,
+    original_exception: Optional[Exception]
+) -> None:
+    """Write the log records for a failure whose level is known to be enabled."""
+    _SEVERITY_DISPATCH[severity](log_message)
+    
+    # Log stack trace for ERROR and above; logging formats it only if the
+    # record is actually emitted
+    if severity.value >= _ERROR_SEVERITY_VALUE and original_exception:
+        logger.error("Original exception", exc_info=original_exception)
+
 class HardwareError(Exception):
     """
     Base exception class for all hardware-related errors.
@@ -43,6 +169,8 @@ class HardwareError(Exception):
         severity (ErrorSeverity): Severity level of the error
         message (str): Error message
         original_exception (Exception, optional): Original exception that caused this error
+        
+    Pass log=False to construct the error without logging it.
     """
     
     def __init__(
@@ -51,7 +179,8 @@ class HardwareError(Exception):
         error_type: HardwareErrorType,
         severity: ErrorSeverity,
         message: str,
-        original_exception: Optional[Exception] = None
+        original_exception: Optional[Exception] = None,
+        log: bool = True
     ):
         self.device_type = device_type
         self.error_type = error_type
@@ -60,33 +189,18 @@ class HardwareError(Exception):
         self.original_exception = original_exception
         
         # Construct the full error message
-        full_message = f"[{device_type.upper()}] {error_type.name} error: {message}"
-        if original_exception:
-            full_message += f" (Caused by: {type(original_exception).__name__}: {str(original_exception)})"
-            
-        super().__init__(full_message)
+        super().__init__(_format_hardware_error(device_type.upper(), error_type, message,
+                                                original_exception))
         
         # Log the error based on severity
-        self._log_error()
+        if log:
+            self._log_error()
         
     def _log_error(self):
         """Log the error with the appropriate severity level."""
-        log_message = f"{self.device_type.upper()} {self.error_type.name} error: {self.message}"
-        
-        if self.severity == ErrorSeverity.INFO:
-            logger.info(log_message)
-        elif self.severity == ErrorSeverity.WARNING:
-            logger.warning(log_message)
-        elif self.severity == ErrorSeverity.ERROR:
-            logger.error(log_message)
-        elif self.severity == ErrorSeverity.CRITICAL:
-            logger.critical(log_message)
-        elif self.severity == ErrorSeverity.FATAL:
-            logger.critical(f"FATAL: {log_message}")
-        
-        # Log stack trace for ERROR and above
-        if self.severity.value >= ErrorSeverity.ERROR.value and self.original_exception:
-            logger.error(f"Original exception: {traceback.format_exc()}")
+        # The exception's own message is the log message; nothing is re-formatted
+        if logger.isEnabledFor(_SEVERITY_TO_LOGLEVEL[self.severity]):
+            _emit_hardware_failure(self.severity, self.args[0], self.original_exception)
 
 # Specific hardware error classes
 class CameraError(HardwareError):
@@ -97,9 +211,10 @@ class CameraError(HardwareError):
         error_type: HardwareErrorType,
         severity: ErrorSeverity,
         message: str,
-        original_exception: Optional[Exception] = None
+        original_exception: Optional[Exception] = None,
+        log: bool = True
     ):
-        super().__init__("camera", error_type, severity, message, original_exception)
+        super().__init__("camera", error_type, severity, message, original_exception, log)
 
 class ActuatorError(HardwareError):
     """Exception class for actuator-related errors."""
@@ -109,9 +224,10 @@ class ActuatorError(HardwareError):
         error_type: HardwareErrorType,
         severity: ErrorSeverity,
         message: str,
-        original_exception: Optional[Exception] = None
+        original_exception: Optional[Exception] = None,
+        log: bool = True
     ):
-        super().__init__("actuator", error_type, severity, message, original_exception)
+        super().__init__("actuator", error_type, severity, message, original_exception, log)
 
 class LaserError(HardwareError):
     """Exception class for laser-related errors."""
@@ -121,20 +237,35 @@ class LaserError(HardwareError):
         error_type: HardwareErrorType,
         severity: ErrorSeverity,
         message: str,
-        original_exception: Optional[Exception] = None
+        original_exception: Optional[Exception] = None,
+        log: bool = True
     ):
-        super().__init__("laser", error_type, severity, message, original_exception)
+        super().__init__("laser", error_type, severity, message, original_exception, log)
+
+# Device type -> specific HardwareError subclass
+_DEVICE_ERROR_CLS: Dict[str, Type[HardwareError]] = {
+    "camera": CameraError,
+    "actuator": ActuatorError,
+    "laser": LaserError,
+}
+
+# Shared read-only default for handle_hardware_errors(error_map=None)
+_EMPTY_ERROR_MAP: Mapping[Type[Exception], Tuple[HardwareErrorType, ErrorSeverity]] = MappingProxyType({})
 
 # Error handling decorators
 def handle_hardware_errors(
     device_type: str,
     default_return: Any = None,
     rethrow: bool = False,
-    error_map: Optional[Dict[Type[Exception], Tuple[HardwareErrorType, ErrorSeverity]]] = None
+    error_map: Optional[Mapping[Type[Exception], Tuple[HardwareErrorType, ErrorSeverity]]] = None
 ):
     """
     Decorator for handling hardware-related errors in a standardized way.
     
+    Repeated failures of the decorated function with the same error type below
+    CRITICAL severity are logged on the 1st, 2nd, 4th, 8th, ... occurrence
+    until the function succeeds again.
+    
     Args:
         device_type (str): Type of device (e.g., "camera", "actuator")
         default_return (Any, optional): Default return value if an error occurs
@@ -144,14 +275,23 @@ def handle_hardware_errors(
     Returns:
         Callable: Decorated function
     """
-    if error_map is None:
-        error_map = {}
+    error_map = error_map or _EMPTY_ERROR_MAP
+        
+    # Resolve everything that does not depend on the call once, here
+    err_cls = _DEVICE_ERROR_CLS.get(device_type)
+    device_upper = device_type.upper()
+    lookup = error_map.get
+    default_mapping = (HardwareErrorType.UNKNOWN, ErrorSeverity.ERROR)
         
     def decorator(func):
+        # Consecutive failures of this function per error type
+        counters: Dict[HardwareErrorType, int] = {}
+        counters_lock = threading.Lock()
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             try:
-                return func(*args, **kwargs)
+                result = func(*args, **kwargs)
             except HardwareError as e:
                 # Already a HardwareError, just re-raise if needed
                 if rethrow:
@@ -159,25 +299,33 @@ def handle_hardware_errors(
                 return default_return
             except Exception as e:
                 # Map the exception to a HardwareError
-                error_type, severity = error_map.get(
-                    type(e), 
-                    (HardwareErrorType.UNKNOWN, ErrorSeverity.ERROR)
-                )
+                error_type, severity = lookup(type(e), default_mapping)
+                
+                # Log a repeating failure only when its count is a power of two;
+                # CRITICAL and FATAL errors are always logged
+                with counters_lock:
+                    count = counters.get(error_type, 0) + 1
+                    counters[error_type] = count
+                log = count & (count - 1) == 0 or severity.value >= _CRITICAL_SEVERITY_VALUE
+                
+                # The error object is only needed when it is raised
+                if not rethrow:
+                    if log:
+                        _log_hardware_failure(device_upper, error_type, severity, str(e), e)
+                    return default_return
                 
                 # Create the appropriate hardware error
-                if device_type == "camera":
-                    hardware_error = CameraError(error_type, severity, str(e), e)
-                elif device_type == "actuator":
-                    hardware_error = ActuatorError(error_type, severity, str(e), e)
-                elif device_type == "laser":
-                    hardware_error = LaserError(error_type, severity, str(e), e)
+                if err_cls is not None:
+                    hardware_error = err_cls(error_type, severity, str(e), e, log)
                 else:
-                    hardware_error = HardwareError(device_type, error_type, severity, str(e), e)
-                
-                if rethrow:
-                    raise hardware_error
-                    
-                return default_return
+                    hardware_error = HardwareError(device_type, error_type, severity, str(e), e, log)
+                raise hardware_error
+            
+            # Unlocked emptiness check keeps the common success path cheap
+            if counters:
+                with counters_lock:
+                    counters.clear()
+            return result
                 
         return wrapper
     return decorator
@@ -213,14 +361,12 @@ def try_operation(
         return operation(*args, **kwargs)
     except Exception as e:
         # Create the appropriate hardware error
-        if device_type == "camera":
-            hardware_error = CameraError(error_type, severity, f"{error_message}: {str(e)}", e)
-        elif device_type == "actuator":
-            hardware_error = ActuatorError(error_type, severity, f"{error_message}: {str(e)}", e)
-        elif device_type == "laser":
-            hardware_error = LaserError(error_type, severity, f"{error_message}: {str(e)}", e)
+        message = f"{error_message}: {str(e)}"
+        err_cls = _DEVICE_ERROR_CLS.get(device_type)
+        if err_cls is not None:
+            hardware_error = err_cls(error_type, severity, message, e)
         else:
-            hardware_error = HardwareError(device_type, error_type, severity, f"{error_message}: {str(e)}", e)
+            hardware_error = HardwareError(device_type, error_type, severity, message, e)
         
         if rethrow:
             raise hardware_error
@@ -242,6 +388,6 @@ def log_exception(
         exception (Exception): Exception to log
         level (int, optional): Logging level
     """
-    logger.log(level, f"{message}: {str(exception)}")
-    if level >= logging.ERROR:
-        logger.log(level, f"Exception details: {traceback.format_exc()}")
+    # Include the traceback for ERROR and above; logging formats it lazily
+    logger.log(level, f"{message}: {str(exception)}",
+               exc_info=exception if level >= logging.ERROR else None)
@@ -6,11 +6,36 @@ This script opens file explorer windows to show patient directories and captures
 """
 
 import os
+import shutil
 import subprocess
 import time
 from pathlib import Path
 import pyautogui
 
+_screenshot = pyautogui.screenshot
+
+# File explorer command, resolved once instead of probing with `which` per call
+if os.name == 'nt':  # Windows
+    _OPENER = 'explorer'
+else:  # Linux/Mac
+    _OPENER = shutil.which('xdg-open') or shutil.which('open')
+
+def _open_path(path):
+    """
+    Open a path in the platform file explorer.
+    
+    Args:
+        path (Path): Directory to open
+        
+    Returns:
+        bool: True if an explorer was launched
+    """
+    if _OPENER is None:
+        print("Could not find a way to open the file explorer")
+        return False
+    subprocess.Popen([_OPENER, str(path)])
+    return True
+
 def create_screenshot_dir():
     """Create directory for screenshots."""
     screenshots_dir = Path("./docs/screenshots")
@@ -34,16 +59,8 @@ def open_patient_directory():
     abs_path = patient_dir.absolute()
     
     # Open directory in file explorer
-    if os.name == 'nt':  # Windows
-        subprocess.Popen(f'explorer "{abs_path}"')
-    elif os.name == 'posix':  # Linux/Mac
-        if os.system('which xdg-open') == 0:
-            subprocess.Popen(['xdg-open', abs_path])
-        elif os.system('which open') == 0:
-            subprocess.Popen(['open', abs_path])
-        else:
-            print("Could not find a way to open the file explorer")
-            return False
+    if not _open_path(abs_path):
+        return False
     
     print(f"Opened directory: {abs_path}")
     return True
@@ -57,7 +74,7 @@ def capture_directory_screenshot():
         time.sleep(2)
         
         # Take screenshot
-        screenshot = pyautogui.screenshot()
+        screenshot = _screenshot()
         
         # Save as patient directory screenshot
         filename = f"patient_directory_{int(time.time())}.png"
@@ -82,23 +99,15 @@ def open_specific_patient_dir():
         abs_path = Path("./data/patients").absolute()
     
     # Open directory in file explorer
-    if os.name == 'nt':  # Windows
-        subprocess.Popen(f'explorer "{abs_path}"')
-    elif os.name == 'posix':  # Linux/Mac
-        if os.system('which xdg-open') == 0:
-            subprocess.Popen(['xdg-open', abs_path])
-        elif os.system('which open') == 0:
-            subprocess.Popen(['open', abs_path])
-        else:
-            print("Could not find a way to open the file explorer")
-            return False
+    if not _open_path(abs_path):
+        return False
     
     # Wait for file explorer to open
     time.sleep(2)
     
     # Take screenshot
     screenshots_dir = create_screenshot_dir()
-    screenshot = pyautogui.screenshot()
+    screenshot = _screenshot()
     
     # Save screenshot
     if patient_id:
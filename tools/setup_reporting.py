@@ -9,6 +9,8 @@ and sets up the required directories.
 import subprocess
 import sys
 import os
+import shutil
+from importlib.metadata import distribution, PackageNotFoundError
 from pathlib import Path
 
 def ensure_dependencies():
@@ -20,14 +22,19 @@ def ensure_dependencies():
     ]
     
     print("Checking and installing required packages...")
+    missing = []
     for package in required_packages:
+        # Look at installed metadata only; importing pyautogui pulls in GUI libs
         try:
-            __import__(package)
+            distribution(package)
             print(f"✓ {package} already installed")
-        except ImportError:
-            print(f"Installing {package}...")
-            subprocess.run([sys.executable, "-m", "pip", "install", package], check=True)
-            print(f"✓ {package} installed successfully")
+        except PackageNotFoundError:
+            missing.append(package)
+    
+    if missing:
+        print(f"Installing {', '.join(missing)}...")
+        subprocess.run([sys.executable, "-m", "pip", "install", *missing], check=True)
+        print(f"✓ {', '.join(missing)} installed successfully")
 
 def setup_directories():
     """Set up the necessary directories for reports."""
@@ -53,8 +60,7 @@ def copy_reporting_scripts():
         src_path = Path(src_file)
         if src_path.exists():
             dest_path = Path("./") / src_path.name
-            with open(src_path, 'rb') as src, open(dest_path, 'wb') as dst:
-                dst.write(src.read())
+            shutil.copyfile(src_path, dest_path)
             print(f"✓ Copied {src_path} to {dest_path}")
 
 def main():
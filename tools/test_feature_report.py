@@ -38,14 +38,24 @@ def main():
         "patient_directory"
     ]
     
-    # Find the latest screenshot for each feature
+    # Find the latest screenshot for each feature in a single directory pass;
+    # DirEntry.stat() reuses data from the scan where the OS provides it
+    latest_mtime = {}
+    with os.scandir(screenshots_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith(".png"):
+                continue
+            for feature in features:
+                if name.startswith(f"{feature}_"):
+                    mtime = entry.stat().st_mtime
+                    if mtime > latest_mtime.get(feature, float("-inf")):
+                        latest_mtime[feature] = mtime
+                        feature_screenshots[feature] = screenshots_dir / name
+    
     for feature in features:
-        matching_files = list(screenshots_dir.glob(f"{feature}_*.png"))
-        if matching_files:
-            # Sort by modification time to get the latest
-            latest_file = sorted(matching_files, key=lambda f: f.stat().st_mtime, reverse=True)[0]
-            feature_screenshots[feature] = latest_file
-            print(f"Found screenshot for {feature}: {latest_file.name}")
+        if feature in feature_screenshots:
+            print(f"Found screenshot for {feature}: {feature_screenshots[feature].name}")
         else:
             print(f"Warning: No screenshot found for {feature}")
     
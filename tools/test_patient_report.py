@@ -7,9 +7,13 @@ Generates a patient report using existing data without creating new patients.
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from src.data_io.patient_data import PatientDataManager
 
+# Reports are I/O bound (SQLite reads, image copies, HTML writes)
+REPORT_WORKERS = 4
+
 def main():
     """Generate patient report using existing data."""
     print("TOSCA Patient Report Generator (Using Existing Data)")
@@ -62,23 +66,27 @@ def main():
         
         patients = [{'patient_id': patient_id}]
     
-    # For each patient, get their sessions and generate a report for the most recent session
+    # For each patient, find the most recent session to report on
+    targets = []
     for patient in patients:
         patient_id = patient['patient_id']
-        sessions = pdm.get_treatment_sessions(patient_id)
+        session = pdm.get_latest_treatment_session(patient_id)
         
-        if not sessions:
+        if not session:
             print(f"No sessions found for patient {patient_id}")
             continue
         
-        # Get the most recent session
-        session = sessions[0]  # Already sorted by date DESC
         session_id = session['session_id']
-        
-        # Generate the report
         print(f"Generating report for patient {patient_id}, session {session_id}...")
-        report_path = pdm.generate_session_report(session_id)
-        
+        targets.append((patient_id, session_id))
+    
+    # Generate the reports concurrently; each writes to its own patient directory
+    with ThreadPoolExecutor(max_workers=REPORT_WORKERS) as executor:
+        report_paths = list(executor.map(
+            pdm.generate_session_report, [session_id for _, session_id in targets]
+        ))
+    
+    for (patient_id, session_id), report_path in zip(targets, report_paths):
         if report_path:
             print(f"Generated report at: {report_path}")
             